@@ -0,0 +1,787 @@
+"""
+HTTP client for the CodVid.AI backend, shared by the Streamlit app and headless tools
+"""
+
+import streamlit as st
+import requests
+import json
+from datetime import datetime
+import time
+from typing import List, Dict, Optional
+
+from config import Config
+from records import ReelSnapshot, TaskRecords, TaskStatus, normalize_task_details
+from metrics_store import get_metrics_store
+
+
+class APIClient:
+    """API client for interacting with the backend"""
+    
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.session_token = None
+        self.debug_enabled = False
+        # Version-stamped task details cache; attached by main() from session state
+        self.task_cache = None
+        # Short-lived cache of list endpoints ({key: (fetched_at, items)}); attached by main()
+        self.list_cache = None
+        # Shared, briefly cached task status lookups; attached by main()
+        self.status_poller = None
+        # Per-project search index over chat history; attached by main()
+        self.chat_index = None
+        # Session user data and API log, attached by main() so background chat workers can write them
+        self.user_data = None
+        self.api_logs = None
+    
+    def set_debug(self, enabled: bool):
+        self.debug_enabled = enabled
+
+    def set_log_raw_streaming(self, enabled: bool):
+        """Enable saving raw streaming chunks into the debug logs."""
+        self.log_raw_streaming = enabled
+    
+    def _sanitize_headers(self, headers: dict) -> dict:
+        sanitized = dict(headers or {})
+        if 'Authorization' in sanitized:
+            token = sanitized['Authorization']
+            if isinstance(token, str) and token.startswith('Bearer '):
+                sanitized['Authorization'] = 'Bearer ****'
+        return sanitized
+    
+    def _append_log(self, entry: dict):
+        try:
+            (self.api_logs if self.api_logs is not None else st.session_state.api_logs).append(entry)
+        except Exception:
+            pass
+
+    # ---------- Local cache helpers (demo-parity) ----------
+    def _get_cache(self) -> dict:
+        return self.user_data if self.user_data is not None else st.session_state.local_user_data
+
+    def append_chat_message(self, project_name: str, message: dict):
+        """Append a message to the project's cached chats (safe off the script thread)"""
+        project = self._get_cache().setdefault("projects", {}).setdefault(project_name, {})
+        chats = project.setdefault("chats", [])
+        chats.append(message)
+        if self.chat_index is not None and project_name in self.chat_index:
+            self.chat_index.sync(project_name, chats)
+
+    def apply_user_data_mods(self, context_mods: list[dict]):
+        cache = self._get_cache()
+        modified_projects: set[str] = set()
+        chat_projects: set[str] = set()
+        for mod in context_mods or []:
+            key_path = mod.get("key_path")
+            mode = mod.get("mode")
+            value = mod.get("value")
+            if not isinstance(key_path, list) or mode not in {"create", "edit", "del", "append"}:
+                continue
+            if len(key_path) >= 2 and key_path[0] == "projects" and isinstance(key_path[1], str):
+                if not (len(key_path) == 3 and key_path[2] == "mod_count"):
+                    modified_projects.add(key_path[1])
+                if len(key_path) >= 3 and key_path[2] == "chats":
+                    chat_projects.add(key_path[1])
+                    # Appends are indexed incrementally; anything else rewrites history
+                    if (mode != "append" or len(key_path) > 3) and self.chat_index is not None:
+                        self.chat_index.invalidate(key_path[1])
+            # Traverse to parent
+            target = cache
+            try:
+                for key in key_path[:-1]:
+                    if isinstance(target, dict):
+                        if key not in target:
+                            if mode == "create":
+                                target[key] = {}
+                            else:
+                                raise KeyError
+                        target = target[key]
+                    elif isinstance(target, list) and isinstance(key, int):
+                        target = target[key]
+                    else:
+                        raise TypeError
+                last_key = key_path[-1]
+                if mode == "create":
+                    if isinstance(target, dict):
+                        target[last_key] = value
+                    elif isinstance(target, list) and isinstance(last_key, int):
+                        if last_key == len(target):
+                            target.append(value)
+                        elif last_key < len(target):
+                            target[last_key] = value
+                elif mode == "edit":
+                    if isinstance(target, dict):
+                        target[last_key] = value
+                    elif isinstance(target, list) and isinstance(last_key, int):
+                        target[last_key] = value
+                elif mode == "del":
+                    if isinstance(target, dict):
+                        if last_key in target:
+                            del target[last_key]
+                    elif isinstance(target, list) and isinstance(last_key, int):
+                        if last_key < len(target):
+                            target.pop(last_key)
+                elif mode == "append":
+                    if isinstance(target, dict):
+                        if last_key not in target or not isinstance(target[last_key], list):
+                            target[last_key] = []
+                        target[last_key].append(value)
+                    elif isinstance(target, list) and isinstance(last_key, int):
+                        if last_key < len(target):
+                            if not isinstance(target[last_key], list):
+                                target[last_key] = []
+                            target[last_key].append(value)
+            except Exception:
+                continue
+        # Increment mod_count
+        for project_name in modified_projects:
+            try:
+                proj = cache.get("projects", {}).get(project_name)
+                if proj is not None:
+                    proj["mod_count"] = int(proj.get("mod_count", 0)) + 1
+            except Exception:
+                continue
+        if self.chat_index is not None:
+            for project_name in chat_projects:
+                chats = cache.get("projects", {}).get(project_name, {}).get("chats")
+                if project_name in self.chat_index and isinstance(chats, list):
+                    self.chat_index.sync(project_name, chats)
+
+    def mark_project_stale(self, project_name: str):
+        """Make the next check_and_reload_project_data refetch the project (after a cut-off stream)"""
+        project = self._get_cache().get("projects", {}).get(project_name)
+        if isinstance(project, dict):
+            project["mod_count"] = None
+
+    def get_project_mod_count(self, project_name: str) -> int | None:
+        payload = {"project_name": project_name}
+        result = self._make_request("/codvid-ai/project/get-project-mod-count", method="POST", data=payload)
+        if result and result.get("result"):
+            return result.get("response", {}).get("mod_count")
+        return None
+
+    def load_project_into_cache(self, project_name: str) -> bool:
+        data = {"project_name": project_name}
+        res = self._make_request("/codvid-ai/project/get-project-data", method="POST", data=data)
+        if res and res.get("result"):
+            proj = res.get("response", {}).get("project_data")
+            if proj is not None:
+                cache = self._get_cache()
+                cache.setdefault("projects", {})[project_name] = proj
+                return True
+        return False
+
+    def check_and_reload_project_data(self, project_name: str) -> bool:
+        cache = self._get_cache()
+        server_mod = self.get_project_mod_count(project_name)
+        local_mod = cache.get("projects", {}).get(project_name, {}).get("mod_count")
+        if server_mod is None:
+            return False
+        if local_mod != server_mod:
+            return self.load_project_into_cache(project_name)
+        return True
+
+    def ensure_project_loaded(self, project_name: str) -> bool:
+        cache = self._get_cache()
+        if project_name in cache.get("projects", {}):
+            return True
+        return self.load_project_into_cache(project_name)
+    
+    def _make_request(self, endpoint: str, method: str = "POST", data: dict | None = None, stream: bool = False, timeout_seconds: int = 300,
+                      with_status: bool = False):
+        """Make HTTP request to the API (supports streaming).
+
+        With ``with_status`` a non-streaming call returns ``(status_code, body)``
+        so callers can act on specific error codes; status_code is None when
+        the request itself failed.
+        """
+        url = f"{self.base_url}{endpoint}"
+        headers = {
+            "Accept": "application/json"
+        }
+        
+        if self.session_token:
+            headers["Authorization"] = f"Bearer {self.session_token}"
+        
+        payload = None
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            payload = {
+                "schema_version": "4.0",
+                "data": data
+            }
+        
+        import time as _time
+        start_time = _time.time()
+        req_payload = payload
+        req_headers = self._sanitize_headers(headers)
+        
+        try:
+            if stream:
+                response = requests.request(
+                    method=method.upper(),
+                    url=url,
+                    headers=headers,
+                    json=payload,
+                    timeout=timeout_seconds,
+                    stream=True,
+                )
+                # Do not append any client-generated summary for streaming responses here.
+                # Raw server-sent JSON chunks will be logged verbatim in
+                # `process_streaming_response` when `debug_enabled` and
+                # `log_raw_streaming` are enabled.
+                return response
+            else:
+                response = requests.request(
+                    method=method.upper(),
+                    url=url,
+                    headers=headers,
+                    json=payload,
+                    timeout=timeout_seconds,
+                )
+                if response.status_code in [200, 201]:
+                    res_json = response.json()
+                    if self.debug_enabled:
+                        self._append_log({
+                            'timestamp': datetime.now().isoformat(),
+                            'endpoint': endpoint,
+                            'method': method.upper(),
+                            'stream': False,
+                            'request': {'url': url, 'headers': req_headers, 'body': req_payload},
+                            'response': {'status_code': response.status_code, 'body': res_json},
+                            'duration_ms': int((_time.time() - start_time) * 1000),
+                        })
+                    return (response.status_code, res_json) if with_status else res_json
+                else:
+                    print(f"API Error: {response.status_code} - {response.text}")
+                    if self.debug_enabled:
+                        self._append_log({
+                            'timestamp': datetime.now().isoformat(),
+                            'endpoint': endpoint,
+                            'method': method.upper(),
+                            'stream': False,
+                            'request': {'url': url, 'headers': req_headers, 'body': req_payload},
+                            'response': {'status_code': response.status_code, 'body': response.text},
+                            'duration_ms': int((_time.time() - start_time) * 1000),
+                        })
+                    return (response.status_code, None) if with_status else None
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed: {e}")
+            if self.debug_enabled:
+                self._append_log({
+                    'timestamp': datetime.now().isoformat(),
+                    'endpoint': endpoint,
+                    'method': method.upper(),
+                    'stream': stream,
+                    'request': {'url': url, 'headers': req_headers, 'body': req_payload},
+                    'response': {'error': str(e)},
+                    'duration_ms': int((_time.time() - start_time) * 1000),
+                })
+            return (None, None) if with_status else None
+    
+    def login(self, email: str, password: str) -> bool:
+        """Login user"""
+        data = {"auth_type": "email", "email": email, "password": password}
+        result = self._make_request("/codvid-ai/auth/login", data=data)
+        if result and result.get("result"):
+            self.session_token = result.get("token")
+            # Cached lists belong to whoever was logged in before
+            self.invalidate_list_cache()
+            return True
+        return False
+    
+    def signup(self, email: str, password: str) -> bool:
+        """Sign up user"""
+        data = {"auth_type": "email", "email": email, "password": password}
+        result = self._make_request("/codvid-ai/auth/signup", data=data)
+        return result and result.get("result")
+    
+    def delete_account(self) -> bool:
+        """Delete user account"""
+        result = self._make_request("/codvid-ai/user/delete-account", data={})
+        if result and result.get("result"):
+            self.session_token = None
+            return True
+        return False
+    
+    # ---------- List cache (short TTL, invalidated on writes) ----------
+    def _cached_list(self, key: str, loader):
+        """Loader result, cached for the TTL; loaders return None on failure so errors are never cached"""
+        if self.list_cache is None:
+            return loader()
+        entry = self.list_cache.get(key)
+        if entry is not None and time.time() - entry[0] < Config.LIST_CACHE["ttl_seconds"]:
+            return list(entry[1])
+        items = loader()
+        if items is not None:
+            self.list_cache[key] = (time.time(), list(items))
+        return items
+
+    def invalidate_list_cache(self, key: Optional[str] = None, prefix: Optional[str] = None):
+        if self.list_cache is None:
+            return
+        if key is None and prefix is None:
+            self.list_cache.clear()
+        elif prefix is not None:
+            for cached_key in [k for k in self.list_cache if k.startswith(prefix)]:
+                del self.list_cache[cached_key]
+        else:
+            self.list_cache.pop(key, None)
+    
+    def get_project_list(self) -> List[str]:
+        """Get list of user projects"""
+        return self._cached_list("projects", self._fetch_project_list) or []
+
+    def _fetch_project_list(self) -> Optional[List[str]]:
+        result = self._make_request("/codvid-ai/project/get-project-list", data={})
+        if result and result.get("result"):
+            return result.get("response", {}).get("project_list", [])
+        return None
+    
+    def create_project(self, project_name: str) -> bool:
+        """Create a new project"""
+        data = {"project_name": project_name}
+        result = self._make_request("/codvid-ai/project/create-project", data=data)
+        self.invalidate_list_cache("projects")
+        return result and result.get("result")
+    
+    def delete_project(self, project_name: str, invalidate: bool = True) -> bool:
+        """Delete a project. Bulk callers pass invalidate=False and invalidate once at the end."""
+        data = {"project_name": project_name}
+        
+        # Add debug logging
+        if self.debug_enabled:
+            print(f"DEBUG: Attempting to delete project: {project_name}")
+            print(f"DEBUG: Request data: {data}")
+        
+        result = self._make_request("/codvid-ai/project/delete-project", data=data)
+        if invalidate:
+            self.invalidate_list_cache("projects")
+        
+        # Add debug logging for result
+        if self.debug_enabled:
+            print(f"DEBUG: Delete project result: {result}")
+            if result:
+                print(f"DEBUG: Result success: {result.get('result')}")
+            else:
+                print("DEBUG: No result returned from delete request")
+        
+        return result and result.get("result")
+    
+    def get_project_data(self, project_name: str) -> Optional[Dict]:
+        """Get project data"""
+        data = {"project_name": project_name}
+        result = self._make_request("/codvid-ai/project/get-project-data", data=data)
+        if result and result.get("result"):
+            return result.get("response", {}).get("project_data")
+        return None
+    
+    def ai_chat(self, project_name: str, message: str, timeout_seconds=300):
+        """Send message to AI chat (streaming). Returns streaming response object.
+        
+        The response object can be iterated over to get chunks in real-time.
+        ``timeout_seconds`` may be a (connect, read) pair; with streaming the
+        read timeout bounds the gap between chunks, not the whole reply.
+        """
+        request_data = {
+            "project_name": project_name,
+            "message": {
+                "role": "user",
+                "type": "text",
+                "text": message,
+            },
+        }
+        import time as _time
+        start_time = _time.time()
+        response = self._make_request("/codvid-ai/ai/respond", method="POST", data=request_data, stream=True,
+                                      timeout_seconds=timeout_seconds)
+        if not response:
+            return None
+        
+        # Return the streaming response object for real-time processing
+        return response
+    
+    def process_streaming_response(self, response, project_name: str):
+        """Process streaming response and yield text chunks in real-time.
+        
+        This method yields (text_chunk, is_final, data_mods) tuples.
+        """
+        aggregated_text = ""
+        chunks_collected = []
+        raw_chunks = []
+        assistant_message_added_via_mods = False
+        
+        try:
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if not chunk:
+                    continue
+                # Save raw chunk if enabled for later logging
+                try:
+                    raw_chunks.append(chunk)
+                except Exception:
+                    pass
+
+                # Log each raw chunk immediately if enabled
+                try:
+                    if getattr(self, 'debug_enabled', False) and getattr(self, 'log_raw_streaming', False):
+                        # Try to parse chunk as JSON for clearer logs; otherwise store raw.
+                        parsed = None
+                        try:
+                            parsed = json.loads(chunk)
+                        except Exception:
+                            parsed = None
+
+                        entry = {
+                            'timestamp': datetime.now().isoformat(),
+                            'endpoint': '/codvid-ai/ai/respond',
+                            'method': 'POST',
+                            'stream': True,
+                            'project': project_name,
+                        }
+                        if parsed is not None:
+                            entry['response'] = parsed
+                        else:
+                            entry['response'] = {'raw': chunk}
+
+                        self._append_log(entry)
+                except Exception:
+                    pass
+
+                try:
+                    chunk_data = json.loads(chunk)
+                except Exception:
+                    # Skip non-json chunks but continue collecting raw data
+                    continue
+                
+                if chunk_data.get("result"):
+                    chunks_collected.append(chunk_data)
+                    resp = chunk_data.get("response", {})
+                    
+                    # Collect assistant text if provided
+                    text_piece = resp.get("text") or resp.get("message", {}).get("text")
+                    if text_piece:
+                        aggregated_text += text_piece
+                        # Yield the text chunk for real-time display
+                        yield text_piece, False, None
+
+                    # Parse data_mods to capture assistant messages appended to chats
+                    data_mods = resp.get("data_mods") or []
+                    if isinstance(data_mods, list):
+                        # Apply to local cache
+                        self.apply_user_data_mods(data_mods)
+                        for mod in data_mods:
+                            try:
+                                key_path = mod.get("key_path")
+                                mode = mod.get("mode")
+                                value = mod.get("value")
+                                if (
+                                    isinstance(key_path, list)
+                                    and len(key_path) >= 3
+                                    and key_path[-2] == project_name
+                                    and key_path[-1] == "chats"
+                                    and mode in ("append", "create")
+                                ):
+                                    # Check if this mod adds an assistant message
+                                    messages = value if isinstance(value, list) else [value]
+                                    for m in messages:
+                                        if isinstance(m, dict) and m.get("role") == "assistant":
+                                            assistant_message_added_via_mods = True
+                                            txt = m.get("text")
+                                            if txt:
+                                                aggregated_text += txt
+                                                # Yield the text chunk for real-time display
+                                                yield txt, False, None
+                            except Exception:
+                                continue
+        except Exception as e:
+            # Yield error information
+            yield f"Error processing response: {str(e)}", True, None
+            return
+        
+        # Optionally log raw streaming chunks for debugging/audit
+        try:
+            if getattr(self, 'debug_enabled', False) and getattr(self, 'log_raw_streaming', False):
+                self._append_log({
+                    'timestamp': datetime.now().isoformat(),
+                    'endpoint': '/codvid-ai/ai/respond',
+                    'method': 'POST',
+                    'stream': True,
+                    'project': project_name,
+                    'raw_streaming_chunks': raw_chunks,
+                    'raw_chunks_count': len(raw_chunks),
+                })
+        except Exception:
+            pass
+
+        # Yield final result
+        yield aggregated_text, True, data_mods if 'data_mods' in locals() else []
+    
+    # Instagram Profile Tracking Methods
+    def create_tracking_task(self, target_profile: str, is_competitor: bool = False) -> Optional[str]:
+        """Create Instagram tracking task"""
+        data = {"target_profile": target_profile, "is_competitor": is_competitor}
+        result = self._make_request("/codvid-ai/ig-tracking/create_task", data=data)
+        if result and result.get("result"):
+            return result.get("response", {}).get("task_id")
+        return None
+    
+    def get_tracking_tasks(self) -> List[Dict]:
+        """Get all tracking tasks"""
+        result = self._make_request("/codvid-ai/ig-tracking/get_tasks", method="GET")
+        if result and result.get("result"):
+            return result.get("response", {}).get("tasks", [])
+        return []
+    
+    def get_task_details(self, task_id: str) -> Optional[Dict]:
+        """Get detailed task information"""
+        result = self._make_request(f"/codvid-ai/ig-tracking/get_task/{task_id}", method="GET")
+        if result and result.get("result"):
+            task = result.get("response", {}).get("task")
+            self._record_profile_snapshot(task_id, task)
+            return task
+        return None
+    
+    def force_scrape_task(self, task_id: str) -> bool:
+        """Force scrape a task"""
+        # Long-running job: allow up to 15 minutes
+        result = self._make_request(
+            f"/codvid-ai/ig-tracking/force_scrape/{task_id}",
+            method="POST",
+            timeout_seconds=900,
+        )
+        self._forget_status(task_id)
+        return result and result.get("result")
+
+    def submit_force_scrape(self, task_id: str, reel: bool = False) -> str:
+        """Force scrape for bulk runs: 'started', 'in_progress' (409, already scraping) or 'failed'"""
+        endpoint = "force_scrape_reel" if reel else "force_scrape"
+        status_code, result = self._make_request(
+            f"/codvid-ai/ig-tracking/{endpoint}/{task_id}",
+            method="POST",
+            timeout_seconds=900,
+            with_status=True,
+        )
+        if status_code == 409:
+            return "in_progress"
+        return "started" if result and result.get("result") else "failed"
+    
+    def delete_tracking_task(self, task_id: str) -> bool:
+        """Delete a tracking task"""
+        result = self._make_request(f"/codvid-ai/ig-tracking/delete_task/{task_id}", method="DELETE")
+        self.invalidate_task_cache(task_id)
+        if result and result.get("result"):
+            self._forget_metric_history(task_id)
+        return result and result.get("result")
+    
+    def update_scrape_interval(self, task_id: str, interval_days: float) -> bool:
+        """Update scrape interval for a task"""
+        data = {"scrape_interval_days": interval_days}
+        result = self._make_request(f"/codvid-ai/ig-tracking/update_scrape_interval/{task_id}", method="PUT", data=data)
+        return result and result.get("result")
+    
+    def get_sentiment_summary(self, task_id: str) -> Optional[Dict]:
+        """Get sentiment analysis summary"""
+        result = self._make_request(f"/codvid-ai/ig-tracking/sentiment_summary/{task_id}", method="GET")
+        if result and result.get("result"):
+            return result.get("response", {}).get("sentiment_summary")
+        return None
+    
+    # ---------- Task details cache (stamped with last_scraped) ----------
+    def get_task_details_cached(self, task: Dict) -> Optional[Dict]:
+        """Get task details, served from the task cache while `last_scraped` is unchanged"""
+        return self._get_task_field_cached(task, "details", self.get_task_details)
+
+    def get_sentiment_summary_cached(self, task: Dict) -> Optional[Dict]:
+        """Get sentiment summary, served from the task cache while `last_scraped` is unchanged"""
+        return self._get_task_field_cached(task, "sentiment_summary", self.get_sentiment_summary)
+
+    def _get_task_field_cached(self, task: Dict, field: str, loader):
+        task_id = task['_id']
+        if self.task_cache is None:
+            return loader(task_id)
+        version = task.get('last_scraped')
+        value = self.task_cache.get(
+            task_id, version, field, wait_seconds=Config.PREFETCH_CONFIG["wait_seconds"]
+        )
+        if value is not None:
+            return value
+        value = loader(task_id)
+        if value is not None:
+            self.task_cache.put(task_id, version, field, value)
+        return value
+
+    def get_derived_cached(self, task: Dict, field: str, build):
+        """Memoize a value derived from a task's payload next to it in the task cache"""
+        if self.task_cache is None:
+            return build()
+        task_id = task['_id']
+        version = task.get('last_scraped')
+        value = self.task_cache.get(task_id, version, field)
+        if value is None:
+            value = build()
+            self.task_cache.put(task_id, version, field, value)
+        return value
+
+    def get_task_records(self, task: Dict) -> Optional[TaskRecords]:
+        """Normalized records for a task's details, built once per scrape and cached with the payload"""
+        details = self.get_task_details_cached(task)
+        if details is None:
+            return None
+        return self.get_derived_cached(task, "records", lambda: normalize_task_details(details, task['_id']))
+
+    def get_scrape_changes(self, task: Dict):
+        """What changed in a task's posts since the previous scrape this session saw, or None"""
+        if self.task_cache is None:
+            return None
+        records = self.get_task_records(task)
+        details = self.get_task_details_cached(task)
+        if records is None:
+            return None
+        # The payload's own stamp: the task dict held by the page predates a forced rescrape
+        version = (details or {}).get('last_scraped') or task.get('last_scraped')
+        return self.task_cache.track_scrape(task['_id'], version, records)
+
+    def peek_task_records(self, task: Dict) -> Optional[TaskRecords]:
+        """Normalized records only if already cached at the task's current stamp (never fetches)"""
+        if self.task_cache is None:
+            return None
+        return self.task_cache.peek(task['_id'], task.get('last_scraped'), "records")
+
+    def prefetch_task_details(self, tasks: List[Dict]) -> int:
+        """Speculatively load details for tasks the user is likely to open next"""
+        if self.task_cache is None or not self.session_token:
+            return 0
+        return self.task_cache.prefetch(self, tasks)
+
+    def invalidate_task_cache(self, task_id: str):
+        if self.task_cache is not None:
+            self.task_cache.invalidate(task_id)
+    
+    # ---------- Metric history (local snapshot store) ----------
+    def _record_profile_snapshot(self, task_id: str, details: Optional[Dict]):
+        """Append profile totals at the payload's last_scraped, once per scrape"""
+        store = get_metrics_store()
+        ts = (details or {}).get('last_scraped')
+        if store is None or not ts:
+            return
+        try:
+            if store.has_snapshot(task_id, ts):
+                return
+            posts = normalize_task_details(details, task_id).posts
+            store.append(
+                task_id, ts, "profile",
+                likes=sum(p.likes for p in posts),
+                comments=sum(p.comments for p in posts),
+                views=sum(p.views for p in posts),
+                posts=len(posts),
+            )
+        except Exception as e:
+            print(f"Failed to record profile snapshot: {e}")
+
+    def _record_reel_snapshots(self, tasks: List[Dict]):
+        """Append one snapshot per reel task at its last_scraped"""
+        store = get_metrics_store()
+        if store is None:
+            return
+        rows = []
+        for task in tasks:
+            snap = ReelSnapshot.from_task(task)
+            if snap.task_id and snap.last_scraped and snap.has_data:
+                rows.append((snap.task_id, snap.last_scraped, "reel", snap.likes, snap.comments, snap.views, 1))
+        try:
+            store.append_many(rows)
+        except Exception as e:
+            print(f"Failed to record reel snapshots: {e}")
+
+    def _forget_metric_history(self, task_id: str):
+        store = get_metrics_store()
+        if store is not None:
+            try:
+                store.delete_task(task_id)
+            except Exception as e:
+                print(f"Failed to delete metric history: {e}")
+
+    def get_metric_history(self, task_id: str, start: Optional[float] = None, end: Optional[float] = None) -> Optional[Dict]:
+        """Locally recorded likes/comments/views history for a task (NumPy arrays)"""
+        store = get_metrics_store()
+        if store is None:
+            return None
+        return store.query(task_id, start, end)
+    
+    # Instagram Reel Tracking Methods
+    def create_reel_tracking_task(self, project_name: str, reel_url: str, scrape_interval_days: int = 2,
+                                  invalidate: bool = True) -> Optional[str]:
+        """Create reel tracking task. Bulk callers pass invalidate=False and invalidate once at the end."""
+        data = {"project_name": project_name, "reel_url": reel_url, "scrape_interval_days": scrape_interval_days}
+        result = self._make_request("/codvid-ai/ig-tracking/create_reel_task", data=data)
+        if invalidate:
+            self.invalidate_list_cache(f"reels:{project_name}")
+        if result and result.get("result"):
+            return result.get("response", {}).get("task_id")
+        return None
+    
+    def get_project_reel_tasks(self, project_name: str) -> List[Dict]:
+        """Get reel tracking tasks for a project"""
+        return self._cached_list(f"reels:{project_name}", lambda: self._fetch_project_reel_tasks(project_name)) or []
+
+    def _fetch_project_reel_tasks(self, project_name: str) -> Optional[List[Dict]]:
+        data = {"project_name": project_name}
+        result = self._make_request("/codvid-ai/ig-tracking/get_project_reel_tasks", data=data)
+        if not (result and result.get("result")):
+            # None keeps a failed request out of the list cache
+            return None
+        tasks = result.get("response", {}).get("tasks", [])
+        if tasks:
+            self._record_reel_snapshots(tasks)
+        return tasks
+
+    def get_reel_snapshots(self, project_name: str) -> List[ReelSnapshot]:
+        """Reel tracking tasks for a project as normalized snapshots"""
+        return [ReelSnapshot.from_task(task) for task in self.get_project_reel_tasks(project_name)]
+    
+    def force_scrape_reel_task(self, task_id: str) -> bool:
+        """Force scrape a reel task"""
+        # Long-running job: allow up to 15 minutes
+        result = self._make_request(
+            f"/codvid-ai/ig-tracking/force_scrape_reel/{task_id}",
+            method="POST",
+            timeout_seconds=900,
+        )
+        self._forget_status(task_id)
+        self.invalidate_list_cache(prefix="reels:")
+        return result and result.get("result")
+
+    def delete_reel_task(self, task_id: str) -> bool:
+        """Delete a reel tracking task"""
+        result = self._make_request(f"/codvid-ai/ig-tracking/delete_reel_task/{task_id}", method="DELETE")
+        self.invalidate_list_cache(prefix="reels:")
+        if result and result.get("result"):
+            self._forget_metric_history(task_id)
+        return result and result.get("result")
+
+    def get_task_status(self, task_id: str) -> Optional[Dict]:
+        """Get real-time processing status for a task (profile or reel)"""
+        result = self._make_request(f"/codvid-ai/ig-tracking/task_status/{task_id}", method="GET")
+        if result and result.get("result"):
+            return result.get("response")
+        return None
+
+    def get_task_status_record(self, task_id: str) -> Optional[TaskStatus]:
+        """Task status as a normalized record, via the shared status poller when attached"""
+        if self.status_poller is not None:
+            return self.status_poller.get(self, task_id)
+        return self.fetch_task_status_record(task_id)
+
+    def get_task_status_records(self, task_ids: List[str]) -> Dict[str, TaskStatus]:
+        """Statuses for many tasks at once; through the poller they are fetched concurrently"""
+        if self.status_poller is not None:
+            return self.status_poller.refresh(self, task_ids)
+        statuses = {task_id: self.fetch_task_status_record(task_id) for task_id in task_ids}
+        return {task_id: status for task_id, status in statuses.items() if status is not None}
+
+    def fetch_task_status_record(self, task_id: str) -> Optional[TaskStatus]:
+        status = self.get_task_status(task_id)
+        return TaskStatus.from_payload(status) if status else None
+
+    def _forget_status(self, task_id: str):
+        if self.status_poller is not None:
+            self.status_poller.forget(task_id)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the metric history store: a synthetic year of half-day
+snapshots for 1,000 tasks, before and after compaction.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from metrics_store import DAY_SECONDS, MetricsStore
+
+
+def build_rows(task_ids, start, days, interval_days):
+    steps = int(days / interval_days)
+    for task_id in task_ids:
+        likes = comments = views = 0
+        for step in range(steps):
+            likes += random.randint(0, 50)
+            comments += random.randint(0, 5)
+            views += random.randint(0, 500)
+            yield (task_id, start + step * interval_days * DAY_SECONDS, "reel", likes, comments, views, 1)
+
+
+def db_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def time_queries(store, task_ids, start, now):
+    t0 = time.perf_counter()
+    for task_id in task_ids:
+        store.query(task_id, start, now)
+    return (time.perf_counter() - t0) / len(task_ids) * 1000
+
+
+def bench_metrics_store(n_tasks=1000, days=365, interval_days=0.5):
+    print("Metric history store benchmark")
+    print(f"{n_tasks} tasks, {days} days, one snapshot every {interval_days} days")
+    print("=" * 50)
+    random.seed(7)
+    now = time.time()
+    start = now - days * DAY_SECONDS
+    task_ids = [f"task-{i:05d}" for i in range(n_tasks)]
+    sample = random.sample(task_ids, min(200, n_tasks))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "metrics.sqlite")
+        store = MetricsStore(path)
+
+        t0 = time.perf_counter()
+        store.append_many(build_rows(task_ids, start, days, interval_days))
+        print(f"Insert:            {time.perf_counter() - t0:8.2f} s")
+        rows_before, size_before = store.count(), db_size(path)
+        query_before = time_queries(store, sample, start, now)
+
+        t0 = time.perf_counter()
+        batches = 0
+        removed = 0
+        while True:
+            batch_removed, finished = store.compact_batch(now)
+            removed += batch_removed
+            batches += 1
+            if finished:
+                break
+        compact_seconds = time.perf_counter() - t0
+        rows_after, size_after = store.count(), db_size(path)
+        query_after = time_queries(store, sample, start, now)
+
+        print(f"Compaction:        {compact_seconds:8.2f} s in {batches} batches")
+        print(f"Rows:              {rows_before:,} -> {rows_after:,} ({removed:,} removed)")
+        print(f"File size:         {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+        print(f"Full-range query:  {query_before:.2f} ms -> {query_after:.2f} ms per task")
+
+        # A second pass must be a no-op
+        t0 = time.perf_counter()
+        again = store.compact(now)
+        print(f"Idle pass:         {time.perf_counter() - t0:8.2f} s, {again} rows removed")
+        store.close()
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    bench_metrics_store(n_tasks=int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
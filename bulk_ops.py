@@ -0,0 +1,80 @@
+"""
+Bounded concurrent execution for bulk API operations
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across all worker threads"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class BulkResult:
+    """Outcome of a bulk run: succeeded items and (item, reason) failures"""
+    __slots__ = ("succeeded", "failed")
+
+    def __init__(self):
+        self.succeeded: List = []
+        self.failed: List[Tuple[object, str]] = []
+
+    @property
+    def failed_items(self) -> List:
+        return [item for item, _ in self.failed]
+
+
+def run_bulk(items: Iterable, action: Callable[[object], object], max_workers: int,
+             on_progress: Optional[Callable[[int, int, object, bool], None]] = None,
+             rate_limiter: Optional[RateLimiter] = None) -> BulkResult:
+    """Run ``action(item)`` for every item on a bounded thread pool.
+
+    A falsy return value or an exception counts as a failure. ``on_progress``
+    is called on the calling thread as each item completes with
+    (done, total, item, ok), so it may safely update Streamlit elements.
+    With a ``rate_limiter``, each call waits for its slot before starting.
+    """
+    items = list(items)
+    if rate_limiter is not None:
+        unlimited = action
+
+        def action(item):
+            rate_limiter.wait()
+            return unlimited(item)
+
+    result = BulkResult()
+    if not items:
+        return result
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))),
+                            thread_name_prefix="bulk") as pool:
+        futures = {pool.submit(action, item): item for item in items}
+        for done, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            try:
+                ok = bool(future.result())
+                reason = "" if ok else "request failed"
+            except Exception as e:
+                ok, reason = False, str(e)
+            if ok:
+                result.succeeded.append(item)
+            else:
+                result.failed.append((item, reason))
+            if on_progress:
+                on_progress(done, len(items), item, ok)
+    return result
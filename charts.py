@@ -0,0 +1,224 @@
+"""
+Plotly figure builders with a process-wide memo cache
+
+Figure construction is the most expensive part of a rerun on the analytics
+pages, so builders are keyed by data identity (task id + last_scraped, or a
+content hash) and reused until the underlying data changes.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Sequence, Tuple
+
+from config import Config
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures keyed by a hashable data identity"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._figures: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object]):
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return fig
+            self.misses += 1
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+
+# Module-level so it outlives script reruns
+figure_cache = FigureCache(Config.CHART_CONFIG["figure_cache_entries"])
+
+
+def sentiment_pie(counts: Dict[str, int], title: str = "Sentiment"):
+    import plotly.express as px
+    return px.pie(values=list(counts.values()), names=list(counts.keys()), title=title)
+
+
+def cached_post_sentiment_pie(task_id: str, post_key, counts: Dict[str, int]):
+    """Per-post sentiment pie, keyed on the post and its counts so a rescrape
+    only rebuilds pies for posts whose comments changed"""
+    return figure_cache.get_or_build(
+        ("post_sentiment_pie", task_id, post_key, tuple(counts.items())),
+        lambda: sentiment_pie(counts),
+    )
+
+
+def content_key(rows: Sequence[Tuple]) -> str:
+    """Stable digest of chart input rows"""
+    return hashlib.blake2b(repr(tuple(rows)).encode(), digest_size=16).hexdigest()
+
+
+def reel_performance_figure(rows: Sequence[Tuple]):
+    """Likes / comments / views bars per reel from (reel_id, likes, comments, views) rows"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    reel_ids = [row[0] for row in rows]
+    fig = make_subplots(
+        rows=1, cols=3,
+        subplot_titles=('Likes', 'Comments', 'Views'),
+        specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
+    )
+    for col, name in enumerate(('Likes', 'Comments', 'Views'), start=1):
+        fig.add_trace(go.Bar(x=reel_ids, y=[row[col] for row in rows], name=name), row=1, col=col)
+    fig.update_layout(height=Config.CHART_CONFIG["height"], showlegend=False)
+    return fig
+
+
+def cached_reel_performance_figure(rows: Sequence[Tuple]):
+    """Reel performance figure, rebuilt only when the reel metrics change"""
+    return figure_cache.get_or_build(
+        ("reel_performance", content_key(rows)),
+        lambda: reel_performance_figure(rows),
+    )
+
+
+REEL_METRICS = ('Likes', 'Comments', 'Views')
+
+
+def reel_performance_frame(rows: Sequence[Tuple]):
+    """Precomputed reel table, memoized on the same content hash as the charts"""
+    def build():
+        import pandas as pd
+        df = pd.DataFrame(list(rows), columns=['Reel ID', *REEL_METRICS])
+        df[list(REEL_METRICS)] = df[list(REEL_METRICS)].astype('int64')
+        return df
+    return figure_cache.get_or_build(("reel_frame", content_key(rows)), build)
+
+
+def top_n_with_others(df, metric: str, n: int):
+    """Top `n` reels by `metric`, remaining reels summed into one "Others" row"""
+    import pandas as pd
+    ranked = df.sort_values(metric, ascending=False, kind='stable')
+    top = ranked.head(n)
+    rest = ranked.iloc[n:]
+    if rest.empty:
+        return top
+    others = {'Reel ID': f"Others ({len(rest)})"}
+    others.update({m: int(rest[m].sum()) for m in REEL_METRICS})
+    return pd.concat([top, pd.DataFrame([others])], ignore_index=True)
+
+
+def cached_reel_top_n_figure(rows: Sequence[Tuple], metric: str, n: int):
+    """Single bar chart of the top-N reels by one metric plus an "Others" bucket"""
+    def build():
+        import plotly.graph_objects as go
+        data = top_n_with_others(reel_performance_frame(rows), metric, n)
+        fig = go.Figure(go.Bar(x=data['Reel ID'], y=data[metric], name=metric))
+        fig.update_layout(
+            height=Config.CHART_CONFIG["height"], showlegend=False,
+            title=f"Top {n} reels by {metric.lower()}",
+        )
+        return fig
+    return figure_cache.get_or_build(("reel_top_n", content_key(rows), metric, n), build)
+
+
+def cached_reel_scatter_figure(rows: Sequence[Tuple]):
+    """Views vs likes for every reel (marker size ~ comments); WebGL for large counts"""
+    def build():
+        import numpy as np
+        import plotly.graph_objects as go
+        df = reel_performance_frame(rows)
+        comments = df['Comments'].to_numpy(dtype='float64')
+        sizes = 6 + 24 * np.sqrt(comments / comments.max()) if len(df) and comments.max() > 0 else 8
+        trace_cls = go.Scattergl if len(df) > Config.CHART_CONFIG["webgl_point_threshold"] else go.Scatter
+        fig = go.Figure(trace_cls(
+            x=df['Views'], y=df['Likes'], mode='markers',
+            marker=dict(size=sizes, opacity=0.7),
+            text=df['Reel ID'], customdata=df['Comments'],
+            hovertemplate="%{text}<br>Views: %{x:,}<br>Likes: %{y:,}<br>Comments: %{customdata:,}<extra></extra>",
+        ))
+        fig.update_layout(
+            height=Config.CHART_CONFIG["height"], showlegend=False,
+            xaxis_title="Views", yaxis_title="Likes",
+        )
+        return fig
+    return figure_cache.get_or_build(("reel_scatter", content_key(rows)), build)
+
+
+def lttb_indices(x, y, n_out: int):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The middle points are split
+    into ``n_out - 2`` buckets, and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    mean. Buckets are walked in order (each choice depends on the last), but
+    the area search inside a bucket and all bucket means are vectorized.
+    """
+    import numpy as np
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype('int64')
+    edges[-1] = n - 1
+    # Prefix sums give every bucket mean in O(1)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+
+    kept = np.empty(n_out, dtype='int64')
+    kept[0] = 0
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = (cum_x[next_hi] - cum_x[next_lo]) / (next_hi - next_lo)
+        avg_y = (cum_y[next_hi] - cum_y[next_lo]) / (next_hi - next_lo)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def downsample_series(x, y, max_points: int):
+    """(x, y) reduced to at most `max_points` with LTTB"""
+    idx = lttb_indices(x, y, max_points)
+    return x[idx], y[idx]
+
+
+def metric_history_figure(series: Dict, metrics: Sequence[str] = ('likes', 'comments', 'views'),
+                          title: str = "Growth Over Time", max_points: int = None):
+    """One line per metric over snapshot time from a MetricsStore query result.
+
+    Each trace is LTTB-downsampled to ``max_points`` so the chart payload stays
+    bounded however long the history grows.
+    """
+    import pandas as pd
+    import plotly.graph_objects as go
+    max_points = max_points or Config.CHART_CONFIG["max_points_per_trace"]
+    fig = go.Figure()
+    for metric in metrics:
+        if metric in series and series[metric].any():
+            ts, values = downsample_series(series['ts'], series[metric], max_points)
+            mode = 'lines+markers' if len(ts) <= 60 else 'lines'
+            fig.add_trace(go.Scatter(x=pd.to_datetime(ts, unit='s'), y=values, mode=mode, name=metric.title()))
+    fig.update_layout(height=Config.CHART_CONFIG["height"], title=title, hovermode='x unified')
+    return fig
+
+
+def cached_metric_history_figure(task_id: str, series: Dict, **kwargs):
+    """History chart, rebuilt only when a new snapshot arrives for the task"""
+    last_ts = float(series['ts'][-1]) if len(series['ts']) else None
+    return figure_cache.get_or_build(
+        ("metric_history", task_id, len(series['ts']), last_ts, tuple(sorted(kwargs.items()))),
+        lambda: metric_history_figure(series, **kwargs),
+    )
@@ -0,0 +1,100 @@
+"""
+Per-project token index over chat history for in-page search
+"""
+
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from comment_index import tokenize
+
+
+def message_text(message) -> str:
+    if not isinstance(message, dict):
+        return ""
+    return str(message.get("content") or message.get("text") or "")
+
+
+class _ProjectIndex:
+    __slots__ = ("count", "first", "last", "postings")
+
+    def __init__(self):
+        self.count = 0
+        self.first: Optional[str] = None
+        self.last: Optional[str] = None
+        self.postings: Dict[str, array] = {}
+
+
+class ChatIndex:
+    """Word -> message positions for each project's ``chats`` list.
+
+    A project is indexed on its first search and then kept current as chat
+    mods arrive; ``sync`` tokenizes only messages appended since the last
+    call. The list may be swapped for a fresh copy from the server, so the
+    first and last indexed messages are compared to confirm the prefix is
+    unchanged; anything else (a shorter list, or an edit or delete reported
+    through ``invalidate``) rebuilds that project's index.
+    """
+
+    def __init__(self):
+        self._projects: Dict[str, _ProjectIndex] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, project: str) -> bool:
+        return project in self._projects
+
+    def invalidate(self, project: str):
+        with self._lock:
+            self._projects.pop(project, None)
+
+    def sync(self, project: str, messages: Sequence) -> int:
+        """Index new messages; returns how many were indexed"""
+        with self._lock:
+            index = self._projects.get(project)
+            if index is not None and not self._prefix_intact(index, messages):
+                index = None
+            if index is None:
+                index = self._projects[project] = _ProjectIndex()
+            added = len(messages) - index.count
+            postings = index.postings
+            for position in range(index.count, len(messages)):
+                text = message_text(messages[position])
+                for token in tokenize(text):
+                    positions = postings.get(token)
+                    if positions is None:
+                        positions = postings[token] = array("I")
+                    positions.append(position)
+                if position == 0:
+                    index.first = text
+            if added > 0:
+                index.count = len(messages)
+                index.last = message_text(messages[-1])
+            return max(added, 0)
+
+    @staticmethod
+    def _prefix_intact(index: _ProjectIndex, messages: Sequence) -> bool:
+        if len(messages) < index.count:
+            return False
+        if index.count == 0:
+            return True
+        return (message_text(messages[0]) == index.first
+                and message_text(messages[index.count - 1]) == index.last)
+
+    def search(self, project: str, query: str, limit: int = 20) -> Tuple[List[int], int]:
+        """Positions of messages containing every query word, newest first; (positions, total)"""
+        tokens = tokenize(query)
+        with self._lock:
+            index = self._projects.get(project)
+            if index is None or not tokens:
+                return [], 0
+            lists = [index.postings.get(token) for token in tokens]
+            if any(postings is None for postings in lists):
+                return [], 0
+            lists.sort(key=len)
+            matches = set(lists[0])
+            for postings in lists[1:]:
+                matches.intersection_update(postings)
+                if not matches:
+                    return [], 0
+        ordered = sorted(matches, reverse=True)
+        return ordered[:limit], len(ordered)
@@ -0,0 +1,256 @@
+"""
+Per-project outbound chat queues and background consumers for streamed replies
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from config import Config
+
+
+def adds_assistant_message(data_mods, project: str) -> bool:
+    """True when the mods append the assistant's reply to the project's chats"""
+    for mod in data_mods or []:
+        try:
+            key_path = mod.get("key_path")
+            value = mod.get("value")
+            if (
+                isinstance(key_path, list)
+                and len(key_path) >= 3
+                and key_path[-2] == project
+                and key_path[-1] == "chats"
+                and mod.get("mode") in ("append", "create")
+            ):
+                messages = value if isinstance(value, list) else [value]
+                if any(isinstance(m, dict) and m.get("role") == "assistant" for m in messages):
+                    return True
+        except Exception:
+            continue
+    return False
+
+
+# Reply states after a stream was cut short; the partial text is kept on the reply only
+INTERRUPTED = ("stopped", "stalled", "timed out")
+
+
+def close_response(response):
+    """Close a streaming response, interrupting a read blocked on another thread"""
+    try:
+        # urllib3 >= 2.3 can unblock a pending socket read; close() alone waits for it
+        shutdown = getattr(getattr(response, "raw", None), "shutdown", None)
+        if shutdown is not None:
+            shutdown()
+        response.close()
+    except Exception:
+        pass
+
+
+class ChatReply:
+    """One streamed reply; written by its worker thread, read by the page"""
+    __slots__ = ("project", "message", "state", "text", "error", "started_at", "finished_at",
+                 "response", "stop_requested")
+
+    def __init__(self, project: str, message: str):
+        self.project = project
+        self.message = message
+        self.state = "streaming"
+        self.text = ""
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.response = None
+        self.stop_requested = False
+
+    @property
+    def running(self) -> bool:
+        return self.state == "streaming"
+
+    def finish(self, state: str, error: Optional[str] = None):
+        self.error = error
+        self.finished_at = time.time()
+        self.state = state
+
+    def stop(self):
+        self.stop_requested = True
+        if self.response is not None:
+            close_response(self.response)
+
+
+class _WatchedResponse:
+    """Wraps the stream for process_streaming_response: ends it at the total
+    deadline and records why it was cut short (``interrupted``)"""
+    __slots__ = ("response", "reply", "deadline", "stall_timeout", "last_chunk_at", "interrupted")
+
+    def __init__(self, response, reply: ChatReply, stall_timeout: float, max_seconds: float):
+        self.response = response
+        self.reply = reply
+        self.deadline = reply.started_at + max_seconds
+        self.stall_timeout = stall_timeout
+        self.last_chunk_at = time.time()
+        self.interrupted: Optional[str] = None
+
+    def iter_content(self, chunk_size=None, decode_unicode=False):
+        try:
+            for chunk in self.response.iter_content(chunk_size=chunk_size, decode_unicode=decode_unicode):
+                self.last_chunk_at = time.time()
+                if self.reply.stop_requested:
+                    break
+                if self.last_chunk_at > self.deadline:
+                    self.interrupted = "timed out"
+                    return
+                yield chunk
+        except Exception:
+            # The read timeout is the stall timeout: no bytes for that long
+            if self.reply.stop_requested:
+                self.interrupted = "stopped"
+            elif time.time() - self.last_chunk_at >= self.stall_timeout:
+                self.interrupted = "stalled"
+            raise
+        if self.reply.stop_requested:
+            self.interrupted = "stopped"
+
+
+class QueuedMessage:
+    """A message waiting for the project's current reply to finish"""
+    __slots__ = ("id", "text", "queued_at")
+
+    def __init__(self, id: int, text: str):
+        self.id = id
+        self.text = text
+        self.queued_at = time.time()
+
+
+class ChatStreams:
+    """Per-session outbound chat queues, one reply in flight per project.
+
+    ``send`` returns at once. Each project with queued messages gets one
+    daemon worker that dispatches them in order: it appends the user
+    message to the project's chats, opens the stream, applies its data mods
+    and appends the finished reply, all through the client's attached user
+    data (never ``st.session_state``), then moves on to the next message.
+    The page polls ``get`` and ``pending`` from a fragment, so replies keep
+    streaming across reruns and page changes, and several projects can
+    stream at the same time.
+    """
+
+    def __init__(self):
+        self._replies: Dict[str, ChatReply] = {}
+        self._queues: Dict[str, Deque[QueuedMessage]] = {}
+        self._workers: Set[str] = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, project: str) -> Optional[ChatReply]:
+        return self._replies.get(project)
+
+    def pending(self, project: str) -> List[QueuedMessage]:
+        """Messages not yet dispatched, oldest first"""
+        with self._lock:
+            return list(self._queues.get(project, ()))
+
+    def streaming(self) -> List[str]:
+        """Projects with a reply in flight"""
+        with self._lock:
+            return [project for project, reply in self._replies.items() if reply.running]
+
+    def send(self, api_client, project: str, message: str) -> QueuedMessage:
+        """Queue ``message``; it is dispatched as soon as the project's current reply ends"""
+        with self._lock:
+            item = QueuedMessage(next(self._ids), message)
+            self._queues.setdefault(project, deque()).append(item)
+            if project in self._workers:
+                return item
+            self._workers.add(project)
+        threading.Thread(
+            target=self._drain, args=(api_client, project), daemon=True, name=f"chat-reply-{project}"
+        ).start()
+        return item
+
+    def stop(self, project: str):
+        """Stop the project's streaming reply; queued messages are still sent"""
+        reply = self._replies.get(project)
+        if reply is not None and reply.running:
+            reply.stop()
+
+    def cancel(self, project: str, item_id: int) -> bool:
+        """Drop a queued message; False once it has been dispatched"""
+        with self._lock:
+            queue = self._queues.get(project)
+            for item in queue or ():
+                if item.id == item_id:
+                    queue.remove(item)
+                    return True
+        return False
+
+    def _drain(self, api_client, project: str):
+        try:
+            while True:
+                with self._lock:
+                    queue = self._queues.get(project)
+                    if not queue:
+                        self._queues.pop(project, None)
+                        self._workers.discard(project)
+                        return
+                    item = queue.popleft()
+                    reply = self._replies[project] = ChatReply(project, item.text)
+                    # Dispatched messages move from the queue into the history in one step
+                    api_client.append_chat_message(project, {'role': 'user', 'type': 'text', 'text': item.text})
+                self._consume(api_client, reply)
+        except Exception:
+            # Let the next send start a fresh worker for whatever is still queued
+            with self._lock:
+                self._workers.discard(project)
+            raise
+
+    @staticmethod
+    def _consume(api_client, reply: ChatReply):
+        project = reply.project
+        settings = Config.CHAT_CONFIG
+        response = None
+        try:
+            response = api_client.ai_chat(
+                project, reply.message,
+                timeout_seconds=(settings["connect_timeout_seconds"], settings["stall_timeout_seconds"]),
+            )
+            if not response:
+                reply.finish("stopped" if reply.stop_requested else "failed", "Failed to get AI response")
+                return
+            reply.response = response
+            if reply.stop_requested:
+                close_response(response)
+            watched = _WatchedResponse(response, reply, settings["stall_timeout_seconds"], settings["max_reply_seconds"])
+            added_via_mods = False
+            for text_chunk, is_final, data_mods in api_client.process_streaming_response(watched, project):
+                # The final tuple carries the whole reply, or an error and no mods
+                if is_final and data_mods is None:
+                    if watched.interrupted:
+                        break
+                    api_client.mark_project_stale(project)
+                    reply.finish("failed", text_chunk)
+                    return
+                added_via_mods = added_via_mods or adds_assistant_message(data_mods, project)
+                if is_final:
+                    reply.text = text_chunk or reply.text
+                    break
+                if text_chunk:
+                    reply.text += text_chunk
+            if watched.interrupted:
+                # Mods from the cut-off stream may be half applied; resync from the server
+                api_client.mark_project_stale(project)
+                reply.finish(watched.interrupted, f"Reply {watched.interrupted}; partial text was not saved")
+                return
+            if reply.text and not added_via_mods:
+                api_client.append_chat_message(project, {'role': 'assistant', 'type': 'text', 'text': reply.text})
+            reply.finish("done")
+        except Exception as e:
+            reply.finish("failed", f"Error processing streaming response: {e}")
+        finally:
+            reply.response = None
+            if response is not None:
+                try:
+                    response.close()
+                except Exception:
+                    pass
@@ -0,0 +1,230 @@
+"""
+Inverted index over top comments across all tracked profiles
+"""
+
+import re
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from records import SENTIMENTS, TaskRecords
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+SENTIMENT_CODES = {sentiment: code for code, sentiment in enumerate(SENTIMENTS)}
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct lowercase words of two or more characters"""
+    return list({token for token in TOKEN_RE.findall((text or "").lower()) if len(token) > 1})
+
+
+def normalize_owner(username: str) -> str:
+    return (username or "").strip().lstrip("@").lower()
+
+
+class CommentHit:
+    __slots__ = ("task_id", "profile", "post_id", "owner", "text", "sentiment", "likes", "timestamp", "score")
+
+    def __init__(self, task_id, profile, post_id, owner, text, sentiment, likes, timestamp, score):
+        self.task_id = task_id
+        self.profile = profile
+        self.post_id = post_id
+        self.owner = owner
+        self.text = text
+        self.sentiment = sentiment
+        self.likes = likes
+        self.timestamp = timestamp
+        self.score = score
+
+
+class CommentIndex:
+    """Per-session full-text index of every profile's top comments.
+
+    Comments are stored column-wise under integer doc ids; each word and each
+    commenter maps to an ascending ``array('I')`` of doc ids. A task is
+    re-indexed only when its ``last_scraped`` stamp changes: its old docs are
+    tombstoned and the new ones appended. Once tombstones pass
+    ``compact_fraction`` of the index, live docs are renumbered in place
+    (order preserved, nothing re-tokenized).
+
+    Queries intersect posting lists (rarest first, by binary search into the
+    longer lists), then filter and rank the candidates with NumPy, so the
+    cost follows the number of matches rather than the size of the index.
+    """
+
+    def __init__(self, compact_fraction: float = 0.3, compact_min: int = 10000):
+        self.compact_fraction = compact_fraction
+        self.compact_min = compact_min
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._tasks: Dict[str, Tuple[object, array]] = {}
+        self._task_ids: List[str] = []
+        self._profiles: List[str] = []
+        self._post_ids: List[Optional[str]] = []
+        self._owners: List[str] = []
+        self._texts: List[str] = []
+        self._likes = array("q")
+        self._ts = array("d")
+        self._sentiment = bytearray()
+        self._alive = bytearray()
+        self._postings: Dict[str, array] = {}
+        self._by_owner: Dict[str, array] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self._texts) - self.dead
+
+    @property
+    def task_count(self) -> int:
+        return len(self._tasks)
+
+    def version_of(self, task_id: str):
+        entry = self._tasks.get(task_id)
+        return entry[0] if entry else None
+
+    def sync(self, task_id: str, version, profile: str, records: TaskRecords) -> bool:
+        """Index a task's comments at ``version``; a no-op when already indexed at it"""
+        with self._lock:
+            current = self._tasks.get(task_id)
+            if current is not None and current[0] == version:
+                return False
+            if current is not None:
+                self._remove(task_id)
+            docs = array("I")
+            for post in records.posts:
+                for comment in post.top_comments:
+                    docs.append(self._add(
+                        task_id, profile, post.post_id, comment.owner_username, comment.text,
+                        comment.sentiment, comment.likes, comment.timestamp,
+                    ))
+            self._tasks[task_id] = (version, docs)
+            self._maybe_compact()
+        return True
+
+    def retain(self, task_ids: Iterable[str]):
+        """Drop tasks that are no longer tracked"""
+        keep = set(task_ids)
+        with self._lock:
+            for task_id in [t for t in self._tasks if t not in keep]:
+                self._remove(task_id)
+            self._maybe_compact()
+
+    def _add(self, task_id, profile, post_id, owner, text, sentiment, likes, timestamp) -> int:
+        doc = len(self._texts)
+        self._task_ids.append(task_id)
+        self._profiles.append(profile)
+        self._post_ids.append(post_id)
+        self._owners.append(owner)
+        self._texts.append(text)
+        self._likes.append(int(likes or 0))
+        self._ts.append(float(timestamp or 0))
+        self._sentiment.append(SENTIMENT_CODES.get(sentiment, SENTIMENT_CODES["neutral"]))
+        self._alive.append(1)
+        for token in tokenize(text):
+            self._postings.setdefault(token, array("I")).append(doc)
+        self._by_owner.setdefault(normalize_owner(owner), array("I")).append(doc)
+        return doc
+
+    def _remove(self, task_id: str):
+        _, docs = self._tasks.pop(task_id)
+        for doc in docs:
+            self._alive[doc] = 0
+        self.dead += len(docs)
+
+    def _maybe_compact(self):
+        if self.dead < self.compact_min or self.dead < self.compact_fraction * len(self._texts):
+            return
+        import numpy as np
+
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        keep = np.flatnonzero(alive)
+        remap = (np.cumsum(alive) - 1).astype(np.uint32)
+
+        def squeeze(postings: Dict[str, array]) -> Dict[str, array]:
+            squeezed = {}
+            for key, docs in postings.items():
+                docs = np.frombuffer(docs, dtype=np.uint32)
+                docs = docs[alive[docs]]
+                if len(docs):
+                    squeezed[key] = array("I", remap[docs].tobytes())
+            return squeezed
+
+        rows = keep.tolist()
+        self._postings = squeeze(self._postings)
+        self._by_owner = squeeze(self._by_owner)
+        self._tasks = {
+            task_id: (version, array("I", remap[np.frombuffer(docs, dtype=np.uint32)].tobytes()))
+            for task_id, (version, docs) in self._tasks.items()
+        }
+        for name in ("_task_ids", "_profiles", "_post_ids", "_owners", "_texts"):
+            column = getattr(self, name)
+            setattr(self, name, [column[row] for row in rows])
+        self._likes = array("q", np.frombuffer(self._likes, dtype=np.int64)[keep].tobytes())
+        self._ts = array("d", np.frombuffer(self._ts, dtype=np.float64)[keep].tobytes())
+        self._sentiment = bytearray(np.frombuffer(self._sentiment, dtype=np.uint8)[keep].tobytes())
+        self._alive = bytearray(b"\x01" * len(rows))
+        self.dead = 0
+
+    def search(self, query: str = "", username: str = "", sentiments: Optional[Iterable[str]] = None,
+               limit: int = 50, half_life_days: float = 30.0, recency_weight: float = 2.0,
+               now: Optional[float] = None) -> Tuple[List[CommentHit], int]:
+        """Top ``limit`` comments containing every query word, optionally by one commenter and
+        sentiment, ranked by log(likes) plus a recency bonus that halves every ``half_life_days``.
+
+        Returns (hits, total matches).
+        """
+        import numpy as np
+
+        now = now or time.time()
+        with self._lock:
+            size = len(self._texts)
+            if size == 0:
+                return [], 0
+            lists = [self._postings.get(token) for token in tokenize(query)]
+            if username.strip():
+                lists.append(self._by_owner.get(normalize_owner(username)))
+            if any(postings is None for postings in lists):
+                return [], 0
+            if lists:
+                lists.sort(key=len)
+                candidates = np.frombuffer(lists[0], dtype=np.uint32).astype(np.int64)
+                for postings in lists[1:]:
+                    if not len(candidates):
+                        break
+                    other = np.frombuffer(postings, dtype=np.uint32)
+                    pos = np.searchsorted(other, candidates)
+                    found = pos < len(other)
+                    found[found] = other[pos[found]] == candidates[found]
+                    candidates = candidates[found]
+                    del other
+            else:
+                candidates = np.arange(size, dtype=np.int64)
+            # Views over the growable buffers are indexed (copied) and released before unlocking
+            candidates = candidates[np.frombuffer(self._alive, dtype=np.uint8)[candidates] == 1]
+            if sentiments:
+                codes = [SENTIMENT_CODES[s] for s in sentiments if s in SENTIMENT_CODES]
+                candidates = candidates[np.isin(np.frombuffer(self._sentiment, dtype=np.uint8)[candidates], codes)]
+            total = len(candidates)
+            if not total:
+                return [], 0
+            likes = np.frombuffer(self._likes, dtype=np.int64)[candidates]
+            ts = np.frombuffer(self._ts, dtype=np.float64)[candidates]
+            age_days = np.where(ts > 0, (now - ts) / 86400.0, np.inf).clip(min=0)
+            scores = np.log1p(np.maximum(likes, 0)) + recency_weight * np.exp2(-age_days / half_life_days)
+            if total > limit:
+                top = np.argpartition(-scores, limit)[:limit]
+            else:
+                top = np.arange(total)
+            top = top[np.lexsort((-ts[top], -scores[top]))]
+            hits = [
+                CommentHit(
+                    self._task_ids[doc], self._profiles[doc], self._post_ids[doc], self._owners[doc],
+                    self._texts[doc], SENTIMENTS[self._sentiment[doc]], int(likes[i]),
+                    float(ts[i]) or None, float(scores[i]),
+                )
+                for i, doc in ((int(i), int(candidates[i])) for i in top)
+            ]
+        return hits, total
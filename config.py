@@ -39,7 +39,15 @@ class Config:
     CHART_CONFIG = {
         "height": 400,
         "use_container_width": True,
-        "showlegend": False
+        "showlegend": False,
+        "figure_cache_entries": 128,
+        # Above this many reels the tracker switches to top-N bars + table
+        "reel_bar_limit": 30,
+        "reel_top_n": 15,
+        # Scatter traces switch to WebGL above this many points
+        "webgl_point_threshold": 500,
+        # Time-series traces are LTTB-downsampled to at most this many points
+        "max_points_per_trace": 400
     }
     
     # Scraping Intervals
@@ -55,6 +63,103 @@ class Config:
         "max_posts_display": 50
     }
     
+    # Task details cache and speculative prefetch
+    PREFETCH_CONFIG = {
+        "max_workers": 4,
+        "max_cache_bytes": 32 * 1024 * 1024,
+        "top_competitors": 4,
+        "recent_profiles": 5,
+        "wait_seconds": 5.0,
+        "scrape_baselines": 256
+    }
+    
+    # List endpoints (projects, ...) cached briefly and invalidated on writes
+    LIST_CACHE = {
+        "ttl_seconds": 30
+    }
+    
+    # Bulk operations (delete, import, force scrape)
+    BULK_CONFIG = {
+        "max_workers": 8,
+        "reel_requests_per_second": 5.0
+    }
+    
+    # Bulk force scrape: scrapes in flight at once and status polling
+    SCRAPE_CONFIG = {
+        "max_concurrent_scrapes": 3,
+        "poll_interval_seconds": 5,
+        "status_max_age_seconds": 3,
+        "status_workers": 4,
+        "completion_grace_seconds": 15,
+        "max_wait_seconds": 1800
+    }
+    
+    # Bulk import of tracking tasks / reels
+    IMPORT_CONFIG = {
+        "max_rows": 1000,
+        "min_interval_days": 0.5,
+        "max_interval_days": 30.0
+    }
+    
+    # Dashboard competitor grid
+    DASHBOARD_CONFIG = {
+        "competitors_per_page": 12
+    }
+    
+    # Portfolio analytics across all tracked profiles
+    PORTFOLIO_CONFIG = {
+        "max_workers": 6,
+        "chart_profiles": 25
+    }
+    
+    # Scrape schedule planner (burst = more than the threshold in one window)
+    SCHEDULE_CONFIG = {
+        "horizon_days": 7,
+        "window_minutes": 60,
+        "burst_threshold": 10,
+        "max_jitter_fraction": 0.15
+    }
+    
+    # Streaming export (payloads in flight = 2 * max_workers; rows per flushed chunk)
+    EXPORT_CONFIG = {
+        "max_workers": 6,
+        "chunk_rows": 5000,
+        # Prepared zips not downloaded or cleared are pruned after this long
+        "archive_max_age_seconds": 3600
+    }
+    
+    # Comment search (rank = log(1 + likes) + weight * 0.5 ** (age_days / half_life))
+    COMMENT_SEARCH_CONFIG = {
+        "results": 50,
+        "recency_half_life_days": 30,
+        "recency_weight": 2.0,
+        "compact_fraction": 0.3
+    }
+    
+    # Project chat (messages rendered per window; search results listed; reply poll while streaming)
+    CHAT_CONFIG = {
+        "window_messages": 50,
+        "search_results": 20,
+        "poll_seconds": 0.5,
+        # Streamed replies: no chunk for stall_timeout ends the reply, as does max_reply overall
+        "connect_timeout_seconds": 10,
+        "stall_timeout_seconds": 60,
+        "max_reply_seconds": 300
+    }
+    
+    # Local metric history (one snapshot per task per scrape)
+    METRICS_STORE = {
+        "enabled": True,
+        "path": "data/metrics.sqlite",
+        # Retention: full resolution, then last-per-day, then last-per-week
+        "full_resolution_days": 14,
+        "daily_resolution_days": 90,
+        # Background compaction
+        "compaction_batch_tasks": 50,
+        "compaction_pause_seconds": 0.05,
+        "compaction_interval_seconds": 3600
+    }
+    
     # Sentiment Analysis Configuration
     SENTIMENT_CONFIG = {
         "max_bar_width": 30,
@@ -62,7 +167,10 @@ class Config:
             "positive": "😊",
             "negative": "😞", 
             "neutral": "😐"
-        }
+        },
+        # Aggregate the summary from cached top comments instead of calling
+        # the sentiment_summary endpoint (debug mode still cross-checks it)
+        "local_summary": True
     }
     
     # CodVid.AI Branding
@@ -107,6 +215,18 @@ class Config:
             "chart_config": cls.CHART_CONFIG,
             "scrape_intervals": cls.SCRAPE_INTERVALS,
             "pagination": cls.PAGINATION,
+            "prefetch_config": cls.PREFETCH_CONFIG,
+            "list_cache": cls.LIST_CACHE,
+            "bulk_config": cls.BULK_CONFIG,
+            "scrape_config": cls.SCRAPE_CONFIG,
+            "import_config": cls.IMPORT_CONFIG,
+            "dashboard_config": cls.DASHBOARD_CONFIG,
+            "portfolio_config": cls.PORTFOLIO_CONFIG,
+            "schedule_config": cls.SCHEDULE_CONFIG,
+            "export_config": cls.EXPORT_CONFIG,
+            "comment_search_config": cls.COMMENT_SEARCH_CONFIG,
+            "chat_config": cls.CHAT_CONFIG,
+            "metrics_store": cls.METRICS_STORE,
             "sentiment_config": cls.SENTIMENT_CONFIG,
             "branding": cls.BRANDING
         } 
\ No newline at end of file
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming export of posts, comments and reel metrics to CSV or Parquet.
+
+Task details are fetched on a bounded pool with a fixed window of payloads
+in flight; each payload is flattened into buffered table writers as soon as
+it arrives and then dropped, so memory stays flat however many profiles the
+portfolio holds.
+
+Headless use:
+    CODVID_PASSWORD=... python exporter.py --email you@example.com --out ./export [--format parquet]
+"""
+
+import argparse
+import csv
+import getpass
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+from records import Post, ReelSnapshot, extract_posts
+
+# table -> [(column, type)]; types map to Parquet columns (CSV writes them as text)
+TABLES = {
+    "posts": [
+        ("task_id", "str"), ("profile", "str"), ("is_competitor", "bool"), ("post_id", "str"), ("url", "str"),
+        ("timestamp", "str"), ("type", "str"), ("likes", "int"), ("comments", "int"), ("views", "int"),
+        ("caption", "str"),
+    ],
+    "comments": [
+        ("task_id", "str"), ("profile", "str"), ("post_id", "str"), ("owner_username", "str"),
+        ("text", "str"), ("sentiment", "str"), ("likes", "int"), ("timestamp", "str"),
+    ],
+    "reels": [
+        ("project", "str"), ("task_id", "str"), ("reel_id", "str"), ("reel_url", "str"), ("last_scraped", "str"),
+        ("scrape_interval_days", "float"), ("likes", "int"), ("comments", "int"), ("views", "int"),
+        ("overall_sentiment", "str"),
+    ],
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+
+
+class TableWriter:
+    """Buffers rows and flushes every ``chunk_rows`` as CSV lines or one Parquet row group"""
+
+    def __init__(self, path: str, columns: List[Tuple[str, str]], fmt: str, chunk_rows: int):
+        self.path = path
+        self.columns = columns
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0
+        self._buffer: List[tuple] = []
+        if fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+            self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([name for name, _ in columns])
+
+    def write(self, row: tuple):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            arrays = [
+                pa.array([row[i] for row in self._buffer], type=field.type)
+                for i, field in enumerate(self._schema)
+            ]
+            self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        else:
+            self._writer.writerows(self._buffer)
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self.fmt == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+
+def post_rows(task: Dict, details: Optional[Dict]) -> Iterator[Tuple[str, tuple]]:
+    """(table, row) pairs for one profile's posts and their comments"""
+    task_id, profile = task.get("_id"), task.get("target_profile")
+    for raw in extract_posts(details):
+        if not isinstance(raw, dict):
+            continue
+        post = Post.from_dict(raw)
+        yield "posts", (
+            task_id, profile, bool(task.get("is_competitor")), post.post_id, post.url, _iso(post.timestamp),
+            post.type, post.likes, post.comments, post.views, post.caption,
+        )
+        for comment in post.top_comments:
+            yield "comments", (
+                task_id, profile, post.post_id, comment.owner_username, comment.text, comment.sentiment,
+                comment.likes, _iso(comment.timestamp),
+            )
+
+
+def reel_rows(project: str, tasks: Iterable[Dict]) -> Iterator[Tuple[str, tuple]]:
+    for task in tasks:
+        reel = ReelSnapshot.from_task(task)
+        yield "reels", (
+            project, reel.task_id, reel.reel_id, reel.reel_url, _iso(reel.last_scraped),
+            float(reel.scrape_interval_days or 0), reel.likes, reel.comments, reel.views, reel.overall_sentiment,
+        )
+
+
+def _load_details(api_client, task: Dict) -> Optional[Dict]:
+    # Reuse a payload the session already holds, but don't add export traffic to the cache
+    cache = getattr(api_client, "task_cache", None)
+    if cache is not None:
+        cached = cache.peek(task["_id"], task.get("last_scraped"), "details")
+        if cached is not None:
+            return cached
+    return api_client.get_task_details(task["_id"])
+
+
+def iter_task_details(api_client, tasks: List[Dict], max_workers: int) -> Iterator[Tuple[Dict, Optional[Dict]]]:
+    """(task, details) in completion order with at most ``2 * max_workers`` payloads outstanding"""
+    remaining = iter(tasks)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export") as pool:
+        futures = {}
+
+        def submit_next():
+            task = next(remaining, None)
+            if task is not None:
+                futures[pool.submit(_load_details, api_client, task)] = task
+
+        for _ in range(2 * max_workers):
+            submit_next()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = futures.pop(future)
+                try:
+                    details = future.result()
+                except Exception as e:
+                    print(f"Export: failed to load {task.get('target_profile')}: {e}")
+                    details = None
+                submit_next()
+                yield task, details
+
+
+def export_portfolio(api_client, out_dir: str, fmt: str = "csv", include_reels: bool = True,
+                     on_progress: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+    """Write posts, comments (and reels) tables into ``out_dir``.
+
+    Returns ``{"rows": {table: count}, "files": [paths], "failed": [profiles]}``.
+    ``on_progress(done, total, label)`` runs on the calling thread.
+    """
+    settings = Config.EXPORT_CONFIG
+    ext = "parquet" if fmt == "parquet" else "csv"
+    os.makedirs(out_dir, exist_ok=True)
+    tables = ["posts", "comments"] + (["reels"] if include_reels else [])
+    writers = {
+        table: TableWriter(os.path.join(out_dir, f"{table}.{ext}"), TABLES[table], ext, settings["chunk_rows"])
+        for table in tables
+    }
+    failed: List[str] = []
+    try:
+        tasks = [task for task in api_client.get_tracking_tasks() if task.get("_id")]
+        projects = (api_client.get_project_list() or []) if include_reels else []
+        total = len(tasks) + len(projects)
+        done = 0
+        for task, details in iter_task_details(api_client, tasks, settings["max_workers"]):
+            if details is None:
+                failed.append(task.get("target_profile") or task["_id"])
+            for table, row in post_rows(task, details):
+                writers[table].write(row)
+            done += 1
+            if on_progress:
+                on_progress(done, total, f"@{task.get('target_profile')}")
+        for project in projects:
+            for table, row in reel_rows(project, api_client.get_project_reel_tasks(project)):
+                writers[table].write(row)
+            done += 1
+            if on_progress:
+                on_progress(done, total, project)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {
+        "rows": {table: writer.rows_written for table, writer in writers.items()},
+        "files": [writer.path for writer in writers.values()],
+        "failed": failed,
+    }
+
+
+def archive_dir() -> str:
+    """App-owned directory holding prepared export archives"""
+    path = os.path.join(tempfile.gettempdir(), "codvid-exports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def prune_archives(max_age_seconds: float, now: Optional[float] = None) -> int:
+    """Delete archives older than ``max_age_seconds`` (left by sessions that never downloaded or cleared)"""
+    now = now if now is not None else time.time()
+    removed = 0
+    for entry in os.scandir(archive_dir()):
+        try:
+            if entry.is_file() and now - entry.stat().st_mtime > max_age_seconds:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def remove_archive(path: Optional[str]):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_archive(api_client, fmt: str = "csv", include_reels: bool = True,
+                   on_progress: Optional[Callable[[int, int, str], None]] = None) -> Tuple[str, Dict]:
+    """Export into a temporary directory and zip it into ``archive_dir()``; returns (zip_path, summary)"""
+    prune_archives(Config.EXPORT_CONFIG["archive_max_age_seconds"])
+    work_dir = tempfile.mkdtemp(prefix="codvid-export-")
+    try:
+        summary = export_portfolio(api_client, work_dir, fmt, include_reels, on_progress)
+        fd, zip_path = tempfile.mkstemp(prefix="codvid-export-", suffix=".zip", dir=archive_dir())
+        os.close(fd)
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for path in summary["files"]:
+                archive.write(path, arcname=os.path.basename(path))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return zip_path, summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export tracked posts, comments and reel metrics")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--no-reels", action="store_true", help="Skip reel snapshots")
+    parser.add_argument("--env", choices=list(Config.API_BASE_URLS), default=None)
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not parquet_available():
+        print("Parquet export needs pyarrow (pip install pyarrow)")
+        return 2
+
+    from api_client import APIClient
+
+    api_client = APIClient(Config.get_api_url(args.env))
+    password = os.getenv("CODVID_PASSWORD") or getpass.getpass("Password: ")
+    if not api_client.login(args.email, password):
+        print("Login failed")
+        return 1
+
+    summary = export_portfolio(
+        api_client, args.out, args.format, not args.no_reels,
+        on_progress=lambda done, total, label: print(f"[{done}/{total}] {label}", file=sys.stderr),
+    )
+    for table, count in summary["rows"].items():
+        print(f"{table}: {count:,} rows")
+    if summary["failed"]:
+        print(f"Could not load {len(summary['failed'])} profiles: {', '.join(summary['failed'][:10])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
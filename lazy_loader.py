@@ -0,0 +1,93 @@
+"""
+Lazy page loading and import-time reporting for the Streamlit router
+"""
+
+import importlib
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Page name -> (module, render function). Modules are imported on first visit.
+PAGES = {
+    'login': ('pages.login', 'show_login'),
+    'dashboard': ('pages.dashboard', 'show_dashboard'),
+    'profile_details': ('pages.profile_details', 'show_profile_details'),
+    'portfolio': ('pages.portfolio', 'show_portfolio'),
+    'schedule_planner': ('pages.schedule_planner', 'show_schedule_planner'),
+    'comment_search': ('pages.comment_search', 'show_comment_search'),
+    'projects': ('pages.projects', 'show_projects_page'),
+    'project_chat': ('pages.project_chat', 'show_project_chat'),
+    'project_tracker': ('pages.project_tracker', 'show_project_tracker'),
+}
+
+# Heavy libraries worth profiling from the debug sidebar
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly.express', 'plotly.graph_objects', 'plotly.subplots']
+
+# module name -> {"seconds": float, "new_modules": int}; kept for the process lifetime
+_import_times: Dict[str, Dict] = {}
+
+
+def timed_import(module_name: str):
+    """Import a module, recording wall time and how many modules it pulled in"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    before = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_times[module_name] = {
+        "seconds": time.perf_counter() - start,
+        "new_modules": len(sys.modules) - before,
+    }
+    return module
+
+
+def load_page(page: str) -> Callable:
+    """Return the render function for a page, importing its module on first use"""
+    module_name, func_name = PAGES[page]
+    return getattr(timed_import(module_name), func_name)
+
+
+def get_import_report() -> List[Dict]:
+    """Imports recorded by the router in this process, slowest first"""
+    rows = [
+        {"module": name, "ms": round(info["seconds"] * 1000, 1), "new_modules": info["new_modules"]}
+        for name, info in _import_times.items()
+    ]
+    return sorted(rows, key=lambda row: row["ms"], reverse=True)
+
+
+def profile_imports(modules: List[str] = None, top_n: int = 15) -> List[Dict]:
+    """Run `python -X importtime` in a fresh interpreter and return the slowest imports.
+
+    Measured out of process so modules already loaded in this worker do not hide
+    their cold-start cost.
+    """
+    modules = modules or HEAVY_MODULES
+    code = "; ".join(f"import {name}" for name in modules)
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except Exception:
+        return []
+    rows = []
+    for line in proc.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append({
+                "module": name.rstrip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top_n]
@@ -0,0 +1,234 @@
+"""
+Local time-series store of reel and profile metric snapshots
+
+One row is kept per (task_id, last_scraped) in a SQLite table clustered on
+that key, so appends are idempotent and range queries for a task are a
+single index range scan. Query results come back as NumPy column arrays
+ready for charting.
+
+Older history is compacted in the background: snapshots past the
+full-resolution window are thinned to the last snapshot per day, and past
+the daily window to the last snapshot per week. Metrics are cumulative
+counters, so the bucket's closing value is the faithful aggregate.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from config import Config
+
+METRIC_COLUMNS = ("likes", "comments", "views", "posts")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    task_id  TEXT    NOT NULL,
+    ts       REAL    NOT NULL,
+    kind     TEXT    NOT NULL,
+    likes    INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    views    INTEGER NOT NULL,
+    posts    INTEGER NOT NULL,
+    PRIMARY KEY (task_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+
+class MetricsStore:
+    """SQLite-backed snapshot store shared by all sessions in the process"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            # Incremental auto-vacuum lets compaction hand freed pages back to
+            # the OS; switching an existing file over needs one full VACUUM.
+            if self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def has_snapshot(self, task_id: str, ts: float) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM snapshots WHERE task_id = ? AND ts = ?", (task_id, ts)
+            ).fetchone()
+        return row is not None
+
+    def append_many(self, rows: Iterable[Tuple]) -> int:
+        """Insert (task_id, ts, kind, likes, comments, views, posts) rows; duplicates are ignored"""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.executemany(
+                    "INSERT OR IGNORE INTO snapshots (task_id, ts, kind, likes, comments, views, posts) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                # Read before COMMIT, which resets the cursor's rowcount
+                inserted = cur.rowcount
+                cur.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return inserted
+
+    def append(self, task_id: str, ts: float, kind: str, likes: int, comments: int, views: int, posts: int = 0) -> bool:
+        return self.append_many([(task_id, ts, kind, likes, comments, views, posts)]) > 0
+
+    def query(self, task_id: str, start: Optional[float] = None, end: Optional[float] = None) -> Dict:
+        """Snapshots for a task in [start, end] as NumPy arrays keyed by ts + metric columns"""
+        import numpy as np
+        sql = "SELECT ts, likes, comments, views, posts FROM snapshots WHERE task_id = ?"
+        params = [task_id]
+        if start is not None:
+            sql += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(end)
+        sql += " ORDER BY ts"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        data = np.array(rows, dtype="float64").reshape(-1, 1 + len(METRIC_COLUMNS))
+        series = {"ts": data[:, 0]}
+        for i, column in enumerate(METRIC_COLUMNS, start=1):
+            series[column] = data[:, i].astype("int64")
+        return series
+
+    def count(self, task_id: Optional[str] = None) -> int:
+        with self._lock:
+            if task_id is None:
+                return self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM snapshots WHERE task_id = ?", (task_id,)
+            ).fetchone()[0]
+
+    def delete_task(self, task_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM snapshots WHERE task_id = ?", (task_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------- Compaction ----------
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _thin(self, task_id: str, start: float, end: float, bucket_seconds: int) -> int:
+        """Keep only the last snapshot per bucket for rows with start <= ts < end"""
+        cur = self._conn.execute(
+            "DELETE FROM snapshots WHERE task_id = ? AND ts >= ? AND ts < ? AND ts NOT IN ("
+            "  SELECT MAX(ts) FROM snapshots WHERE task_id = ? AND ts >= ? AND ts < ?"
+            "  GROUP BY CAST(ts / ? AS INTEGER))",
+            (task_id, start, end, task_id, start, end, bucket_seconds),
+        )
+        return cur.rowcount
+
+    def compact_batch(self, now: Optional[float] = None, batch_size: int = None) -> Tuple[int, bool]:
+        """Compact the next batch of tasks after the stored watermark.
+
+        Returns (rows_removed, finished_pass). The watermark makes compaction
+        resumable: each call does a bounded amount of work and holds the lock
+        for one batch only, so chart queries interleave with a long pass.
+        """
+        policy = Config.METRICS_STORE
+        now = now if now is not None else time.time()
+        batch_size = batch_size or policy["compaction_batch_tasks"]
+        daily_cutoff = now - policy["full_resolution_days"] * DAY_SECONDS
+        weekly_cutoff = now - policy["daily_resolution_days"] * DAY_SECONDS
+        removed = 0
+        with self._lock:
+            watermark = self._get_meta("compaction_watermark") or ""
+            task_ids = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT task_id FROM snapshots WHERE task_id > ? ORDER BY task_id LIMIT ?",
+                (watermark, batch_size),
+            )]
+            self._conn.execute("BEGIN")
+            try:
+                for task_id in task_ids:
+                    removed += self._thin(task_id, weekly_cutoff, daily_cutoff, DAY_SECONDS)
+                    removed += self._thin(task_id, 0, weekly_cutoff, WEEK_SECONDS)
+                finished = len(task_ids) < batch_size
+                self._set_meta("compaction_watermark", "" if finished else task_ids[-1])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if finished:
+                # incremental_vacuum frees one page per step; executescript
+                # runs it to completion where execute() would stop after one
+                self._conn.executescript("PRAGMA incremental_vacuum;")
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed, finished
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Run a full compaction pass synchronously. Returns rows removed."""
+        total = 0
+        while True:
+            removed, finished = self.compact_batch(now)
+            total += removed
+            if finished:
+                return total
+
+
+def _compaction_loop(store: "MetricsStore"):
+    policy = Config.METRICS_STORE
+    while True:
+        try:
+            _, finished = store.compact_batch()
+        except Exception as e:
+            # Keep the daemon alive; the failed batch was rolled back and is retried next interval
+            print(f"Metrics compaction failed: {e}")
+            finished = True
+        time.sleep(policy["compaction_interval_seconds"] if finished else policy["compaction_pause_seconds"])
+
+
+_store: Optional[MetricsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> Optional[MetricsStore]:
+    """Process-wide store at the configured path, or None if disabled/unavailable"""
+    global _store
+    if not Config.METRICS_STORE["enabled"]:
+        return None
+    with _store_lock:
+        if _store is None:
+            path = os.getenv("METRICS_DB_PATH", Config.METRICS_STORE["path"])
+            try:
+                _store = MetricsStore(path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Metrics store unavailable: {e}")
+                return None
+            threading.Thread(
+                target=_compaction_loop, args=(_store,), name="metrics-compaction", daemon=True
+            ).start()
+        return _store
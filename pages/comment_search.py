@@ -0,0 +1,113 @@
+import streamlit as st
+import time
+from datetime import datetime
+from config import Config
+from bulk_ops import run_bulk
+from comment_index import CommentIndex
+from records import SENTIMENTS
+
+SENTIMENT_EMOJI = {"positive": "😊", "neutral": "😐", "negative": "😞"}
+
+def sync_comment_index(api_client, index, tasks):
+    """Index every task whose payload is already cached; returns tasks still missing"""
+    index.retain(task['_id'] for task in tasks)
+    missing = []
+    for task in tasks:
+        if index.version_of(task['_id']) == task.get('last_scraped'):
+            continue
+        records = api_client.peek_task_records(task)
+        if records is None:
+            missing.append(task)
+        else:
+            index.sync(task['_id'], task.get('last_scraped'), task.get('target_profile'), records)
+    return missing
+
+def show_comment_search(api_client):
+    """Search top comments across every tracked profile"""
+    st.markdown('<h1 class="brand-title">Comment Search</h1>', unsafe_allow_html=True)
+
+    if st.button("Back to Dashboard"):
+        st.session_state.current_page = 'dashboard'
+        st.rerun()
+
+    st.markdown("---")
+
+    tasks = api_client.get_tracking_tasks()
+    if not tasks:
+        st.info("No tracking tasks found. Create your first task from the dashboard!")
+        return
+
+    settings = Config.COMMENT_SEARCH_CONFIG
+    if 'comment_index' not in st.session_state:
+        st.session_state.comment_index = CommentIndex(compact_fraction=settings["compact_fraction"])
+    index = st.session_state.comment_index
+
+    # Only profiles rescraped since they were indexed are re-indexed
+    missing = sync_comment_index(api_client, index, tasks)
+    st.caption(f"{len(index):,} comments indexed from {index.task_count} of {len(tasks)} profiles")
+    if missing and st.button(f"Load and index {len(missing)} more profiles", key="comment_index_load"):
+        progress = st.progress(0.0, text=f"Loading {len(missing)} profiles...")
+
+        def load(task):
+            records = api_client.get_task_records(task)
+            if records is None:
+                return False
+            index.sync(task['_id'], task.get('last_scraped'), task.get('target_profile'), records)
+            return True
+
+        # Profiles that fail to load stay counted in the button above
+        run_bulk(
+            missing, load, Config.PORTFOLIO_CONFIG["max_workers"],
+            on_progress=lambda done, total, task, ok: progress.progress(
+                done / total, text=f"{done}/{total} • @{task.get('target_profile')}"
+            ),
+        )
+        st.rerun()
+
+    col1, col2, col3 = st.columns([3, 2, 2])
+    with col1:
+        query = st.text_input("Keywords", placeholder="price delivery", key="comment_search_query")
+    with col2:
+        username = st.text_input("Commenter", placeholder="@username", key="comment_search_user")
+    with col3:
+        sentiments = st.multiselect("Sentiment", list(SENTIMENTS), key="comment_search_sentiment")
+
+    if not (query.strip() or username.strip() or sentiments):
+        st.info("Enter keywords, a commenter or a sentiment to search.")
+        return
+
+    started = time.perf_counter()
+    hits, total = index.search(
+        query, username, sentiments, limit=settings["results"],
+        half_life_days=settings["recency_half_life_days"], recency_weight=settings["recency_weight"],
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{total:,} matching comments • top {len(hits)} by likes and recency • {elapsed_ms:.0f} ms")
+    if not hits:
+        st.info("No comments match.")
+        return
+
+    st.dataframe(
+        [{
+            "Profile": f"@{hit.profile}",
+            "Comment": hit.text,
+            "Commenter": f"@{hit.owner}",
+            "Sentiment": f"{SENTIMENT_EMOJI.get(hit.sentiment, '')} {hit.sentiment}",
+            "Likes": hit.likes,
+            "Date": datetime.fromtimestamp(hit.timestamp).strftime('%Y-%m-%d') if hit.timestamp else "",
+        } for hit in hits],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    # Jump to the profile a comment came from
+    by_id = {task['_id']: task for task in tasks}
+    profiles = list(dict.fromkeys(hit.task_id for hit in hits if hit.task_id in by_id))
+    selected = st.selectbox(
+        "Open profile", options=profiles, format_func=lambda task_id: f"@{by_id[task_id].get('target_profile')}",
+        index=None, placeholder="Choose a profile...", key="comment_search_open",
+    )
+    if selected:
+        st.session_state.current_profile = by_id[selected]
+        st.session_state.current_page = 'profile_details'
+        st.rerun()
@@ -1,6 +1,10 @@
 import streamlit as st
 from datetime import datetime
 import time
+from config import Config
+from profile_index import PrefixIndex
+from scrape_orchestrator import start_scrape_run
+from task_import import import_rows, mark_duplicates, parse_task_import
 
 def smart_task_selector(api_client, auto_select_first=False):
     """
@@ -54,6 +58,206 @@ def smart_task_selector(api_client, auto_select_first=False):
     
     return None
 
+def select_prefetch_candidates(tasks, recent_ids):
+    """Pick the profiles the user is most likely to open next.
+
+    Order: own profile, recently viewed profiles, then the most recently
+    scraped competitors.
+    """
+    by_id = {task['_id']: task for task in tasks if task.get('_id')}
+    candidates = []
+    seen = set()
+
+    def add(task):
+        if task and task['_id'] not in seen:
+            seen.add(task['_id'])
+            candidates.append(task)
+
+    add(next((task for task in tasks if not task.get('is_competitor', False)), None))
+    for task_id in recent_ids[:Config.PREFETCH_CONFIG["recent_profiles"]]:
+        add(by_id.get(task_id))
+    competitors = sorted(
+        (task for task in tasks if task.get('is_competitor', False) and task.get('last_scraped')),
+        key=lambda task: task['last_scraped'],
+        reverse=True,
+    )
+    for task in competitors[:Config.PREFETCH_CONFIG["top_competitors"]]:
+        add(task)
+    return candidates
+
+SORT_OPTIONS = ["Last scraped", "Status", "Engagement", "Username"]
+
+def competitor_engagement(api_client, tasks):
+    """Engagement per post for tasks whose data is already loaded (never fetches).
+
+    Prefers the portfolio engine's metrics, then falls back to records sitting
+    in the task details cache.
+    """
+    engagement = {}
+    engine = st.session_state.get('portfolio_engine')
+    metrics = engine.metrics if engine is not None else None
+    if metrics is not None and not metrics.empty:
+        engagement.update(metrics['engagement_per_post'].dropna().to_dict())
+    for task in tasks:
+        if task['_id'] in engagement:
+            continue
+        records = api_client.peek_task_records(task)
+        if records and records.posts:
+            engagement[task['_id']] = sum(p.likes + p.comments for p in records.posts) / len(records.posts)
+    return engagement
+
+def sort_competitors(tasks, sort_by, engagement):
+    if sort_by == "Status":
+        return sorted(tasks, key=lambda t: (str(t.get('status', 'active')), -(t.get('last_scraped') or 0)))
+    if sort_by == "Engagement":
+        # Profiles without loaded data go last, most recently scraped first
+        return sorted(tasks, key=lambda t: (t['_id'] not in engagement, -engagement.get(t['_id'], 0),
+                                            -(t.get('last_scraped') or 0)))
+    if sort_by == "Username":
+        return sorted(tasks, key=lambda t: str(t.get('target_profile', '')).lower())
+    return sorted(tasks, key=lambda t: -(t.get('last_scraped') or 0))
+
+def _move_competitor_page(page, pages):
+    st.session_state.competitor_page = min(max(1, page), pages)
+
+def _reset_competitor_page():
+    st.session_state.competitor_page = 1
+
+def competitor_grid_page(api_client, competitor_profiles):
+    """Search, sort and pagination controls; returns the competitors on the current page"""
+    # Prefix index over usernames, rebuilt only when the task list changes
+    index = st.session_state.get('competitor_index')
+    if index is None or index.signature != PrefixIndex.signature_of(competitor_profiles):
+        index = PrefixIndex(competitor_profiles)
+        st.session_state.competitor_index = index
+
+    col_search, col_sort = st.columns([2, 1])
+    with col_search:
+        query = st.text_input(
+            "Search competitors", placeholder="Username starts with...",
+            key="competitor_search", on_change=_reset_competitor_page,
+        )
+    with col_sort:
+        sort_by = st.selectbox(
+            "Sort by", options=SORT_OPTIONS, key="competitor_sort", on_change=_reset_competitor_page
+        )
+
+    matches = index.search(query or "")
+    engagement = competitor_engagement(api_client, matches) if sort_by == "Engagement" else {}
+    matches = sort_competitors(matches, sort_by, engagement)
+    if sort_by == "Engagement" and len(engagement) < len(matches):
+        st.caption("Profiles without loaded data are listed last. Open Portfolio to load them all.")
+
+    per_page = Config.DASHBOARD_CONFIG["competitors_per_page"]
+    pages = max(1, -(-len(matches) // per_page))
+    page = min(max(1, st.session_state.get('competitor_page', 1)), pages)
+
+    if pages > 1:
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        # Callbacks run before the next render, so the buttons' disabled state matches the page
+        with col_prev:
+            st.button("Previous", key="competitor_prev", disabled=page <= 1, use_container_width=True,
+                      on_click=_move_competitor_page, args=(page - 1, pages))
+        with col_next:
+            st.button("Next", key="competitor_next", disabled=page >= pages, use_container_width=True,
+                      on_click=_move_competitor_page, args=(page + 1, pages))
+        with col_info:
+            st.caption(f"Page {page} of {pages} • {len(matches)} profiles")
+    elif query:
+        st.caption(f"{len(matches)} matching profiles")
+    st.session_state.competitor_page = page
+
+    if not matches:
+        st.info("No competitors match your search.")
+    return matches[(page - 1) * per_page:page * per_page]
+
+def show_bulk_import(api_client, tasks):
+    """CSV / text import of many tracking tasks with per-row results"""
+    with st.expander("Bulk Import (CSV or list of usernames)", expanded=False):
+        st.caption(
+            "One profile per line: `username[,competitor][,interval_days]`. A header row is optional; "
+            "profile URLs and @handles are accepted."
+        )
+        uploaded = st.file_uploader("Upload CSV", type=["csv", "txt"], key="bulk_import_file")
+        pasted = st.text_area("Or paste usernames", placeholder="foodxtaste,yes,2\n@another_brand", key="bulk_import_text")
+        col_flag, col_interval = st.columns(2)
+        with col_flag:
+            default_competitor = st.checkbox("Competitors by default", value=True, key="bulk_import_competitor")
+        with col_interval:
+            default_interval = st.number_input(
+                "Default interval (days)", min_value=0.5, max_value=30.0, value=2.0, step=0.5,
+                key="bulk_import_interval"
+            )
+
+        text = uploaded.getvalue().decode("utf-8", errors="replace") if uploaded else (pasted or "")
+        rows = parse_task_import(text, default_competitor, default_interval) if text.strip() else []
+        mark_duplicates(rows, (task.get('target_profile') for task in tasks or []))
+        max_rows = Config.IMPORT_CONFIG["max_rows"]
+        pending = [row for row in rows if row.status == "pending"]
+        if rows:
+            skipped = len(rows) - len(pending)
+            st.caption(f"{len(pending)} to create, {skipped} skipped (duplicates or invalid)")
+        if len(pending) > max_rows:
+            st.error(f"At most {max_rows} profiles per import.")
+        elif pending and st.button(f"Import {len(pending)} profiles", type="primary", key="bulk_import_run"):
+            progress = st.progress(0.0, text=f"Creating {len(pending)} tracking tasks...")
+            import_rows(
+                api_client, rows,
+                on_progress=lambda done, total, row, ok: progress.progress(
+                    done / total, text=f"{done}/{total} • @{row.username} {'created' if ok else 'failed'}"
+                ),
+            )
+            created = sum(row.status == "created" for row in rows)
+            st.session_state.bulk_import_report = [row.as_dict() for row in rows]
+            st.session_state.bulk_import_summary = f"Created {created} of {len(pending)} tracking tasks."
+            st.rerun()
+
+        report = st.session_state.get('bulk_import_report')
+        if report:
+            st.success(st.session_state.get('bulk_import_summary', ""))
+            st.dataframe(report, use_container_width=True, hide_index=True)
+            if st.button("Clear report", key="bulk_import_clear"):
+                del st.session_state.bulk_import_report
+                st.rerun()
+        elif rows:
+            st.dataframe([row.as_dict() for row in rows], use_container_width=True, hide_index=True)
+
+def show_bulk_scrape(api_client, tasks):
+    """Force scrape all or selected profiles, a few at a time, tracked in the background"""
+    run = st.session_state.get('bulk_scrape_run')
+    with st.expander("Bulk Force Scrape", expanded=bool(run and run.running)):
+        labels = {task['_id']: f"@{task.get('target_profile')}" for task in tasks or []}
+        if run is None or not run.running:
+            selected = st.multiselect(
+                "Profiles to scrape (leave empty for all)", options=list(labels), format_func=labels.get,
+                key="bulk_scrape_selection"
+            )
+            target_ids = selected or list(labels)
+            st.caption(
+                f"At most {Config.SCRAPE_CONFIG['max_concurrent_scrapes']} scrapes run at once; "
+                "profiles already being scraped are skipped."
+            )
+            if target_ids and st.button(f"Scrape {len(target_ids)} profiles", type="primary", key="bulk_scrape_start"):
+                st.session_state.bulk_scrape_run = start_scrape_run(
+                    api_client, [(task_id, labels[task_id]) for task_id in target_ids]
+                )
+                st.rerun()
+        if run is not None:
+            st.progress(run.finished / max(1, len(run.jobs)), text=run.summary())
+            st.dataframe([job.as_dict() for job in run.jobs], use_container_width=True, hide_index=True)
+            col_refresh, col_stop = st.columns(2)
+            with col_refresh:
+                if st.button("Refresh", key="bulk_scrape_refresh", use_container_width=True):
+                    st.rerun()
+            with col_stop:
+                if run.running:
+                    if st.button("Stop queued scrapes", key="bulk_scrape_cancel", use_container_width=True):
+                        run.cancel()
+                        st.rerun()
+                elif st.button("Clear", key="bulk_scrape_clear", use_container_width=True):
+                    del st.session_state.bulk_scrape_run
+                    st.rerun()
+
 def show_dashboard(api_client):
     """Show the main dashboard with user profile and competitor tracking"""
     
@@ -137,12 +341,27 @@ def show_dashboard(api_client):
             else:
                 st.error("No projects found. Please create a project first.")
         
-        # Button 2: Add Task
+        # Button 2: Portfolio analytics across all tracked profiles
+        if st.button("Portfolio", use_container_width=True, key="quick_portfolio"):
+            st.session_state.current_page = 'portfolio'
+            st.rerun()
+        
+        # Button 3: Scrape schedule across all profile and reel tasks
+        if st.button("Scrape Schedule", use_container_width=True, key="quick_schedule"):
+            st.session_state.current_page = 'schedule_planner'
+            st.rerun()
+        
+        # Button 4: Search comments across all tracked profiles
+        if st.button("Search Comments", use_container_width=True, key="quick_comment_search"):
+            st.session_state.current_page = 'comment_search'
+            st.rerun()
+        
+        # Button 5: Add Task
         if st.button("Add Task", use_container_width=True, key="quick_add"):
             st.session_state.show_add_task = True
             st.rerun()
         
-        # Button 3: Logout
+        # Button 6: Logout
         if st.button("Logout", use_container_width=True, key="quick_logout"):
             st.session_state.authenticated = False
             st.session_state.session_token = None
@@ -195,8 +414,19 @@ def show_dashboard(api_client):
                 else:
                     st.error("Please enter a profile name")
     
+        show_bulk_import(api_client, tasks)
+    
+    if tasks:
+        show_bulk_scrape(api_client, tasks)
+    
     st.markdown("---")
     
+    # Warm the task cache for the profiles most likely to be opened next
+    if tasks:
+        api_client.prefetch_task_details(
+            select_prefetch_candidates(tasks, st.session_state.get('recent_profiles', []))
+        )
+    
     # Environment selector (based on notebooks)
     st.sidebar.subheader("Environment Settings")
     from config import Config
@@ -221,9 +451,12 @@ def show_dashboard(api_client):
         if competitor_profiles:
             st.markdown('<h2 class="main-header">Competitor Profiles</h2>', unsafe_allow_html=True)
             
+            # Only the visible page of cards (and their buttons) is rendered
+            visible_profiles = competitor_grid_page(api_client, competitor_profiles)
+            
             # Create 2-column grid for competitor profiles
             cols = st.columns(2)
-            for idx, task in enumerate(competitor_profiles):
+            for idx, task in enumerate(visible_profiles):
                 col_idx = idx % 2
                 with cols[col_idx]:
                     # Create detailed profile card
@@ -0,0 +1,177 @@
+import streamlit as st
+import os
+from datetime import datetime
+from config import Config
+from charts import content_key, figure_cache
+from exporter import export_archive, parquet_available, remove_archive
+from portfolio import PortfolioEngine
+
+def portfolio_table(metrics):
+    """Display columns for the portfolio metrics frame"""
+    table = metrics.rename(columns={
+        'target_profile': 'Profile',
+        'posts': 'Posts',
+        'followers': 'Followers',
+        'engagement_per_post': 'Eng./Post',
+        'engagement_rate': 'Eng. Rate %',
+        'posts_per_week': 'Posts/Week',
+        'median_gap_days': 'Median Gap (d)',
+        'pct_positive': 'Positive %',
+        'pct_neutral': 'Neutral %',
+        'pct_negative': 'Negative %',
+        'last_post': 'Last Post',
+    })
+    table['Type'] = metrics['is_competitor'].map({True: 'Competitor', False: 'Own'})
+    return table[[
+        'Profile', 'Type', 'Posts', 'Followers', 'Eng./Post', 'Eng. Rate %',
+        'Posts/Week', 'Median Gap (d)', 'Positive %', 'Neutral %', 'Negative %', 'Last Post',
+    ]]
+
+def portfolio_figures(metrics, limit):
+    """Engagement and sentiment-mix bars for the top profiles, memoized on the metrics"""
+    def build():
+        import plotly.graph_objects as go
+        top = metrics.sort_values('engagement_per_post', ascending=False).head(limit)
+        engagement = go.Figure(go.Bar(x=top['target_profile'], y=top['engagement_per_post'], name='Eng./Post'))
+        engagement.update_layout(
+            height=Config.CHART_CONFIG["height"], title="Engagement per post", showlegend=False
+        )
+        mix = go.Figure()
+        for sentiment, color in (('positive', '#2ca02c'), ('neutral', '#9e9e9e'), ('negative', '#d62728')):
+            mix.add_trace(go.Bar(
+                x=top['target_profile'], y=top[f'pct_{sentiment}'], name=sentiment.title(), marker_color=color
+            ))
+        mix.update_layout(
+            height=Config.CHART_CONFIG["height"], title="Sentiment mix (%)", barmode='stack'
+        )
+        return engagement, mix
+    rows = metrics[['target_profile', 'engagement_per_post', 'pct_positive', 'pct_neutral', 'pct_negative']]
+    key = ("portfolio", content_key(rows.itertuples(index=False, name=None)), limit)
+    return figure_cache.get_or_build(key, build)
+
+def clear_export():
+    """Delete the prepared archive and forget it"""
+    result = st.session_state.pop('export_result', None)
+    if result:
+        remove_archive(result[0])
+
+def show_export(api_client):
+    """Stream every profile's posts and comments (and reel snapshots) into a zip to download"""
+    with st.expander("Export Data", expanded=False):
+        formats = ["CSV"] + (["Parquet"] if parquet_available() else [])
+        col1, col2 = st.columns(2)
+        with col1:
+            fmt = st.radio("Format", formats, horizontal=True, key="export_format")
+        with col2:
+            include_reels = st.checkbox("Include reel snapshots", value=True, key="export_reels")
+        if len(formats) == 1:
+            st.caption("Install pyarrow to enable Parquet export.")
+        if st.button("Prepare export", type="primary", key="export_run"):
+            progress = st.progress(0.0, text="Starting export...")
+            path, summary = export_archive(
+                api_client, fmt.lower(), include_reels,
+                on_progress=lambda done, total, label: progress.progress(done / max(1, total), text=f"{done}/{total} • {label}"),
+            )
+            clear_export()
+            st.session_state.export_result = (path, summary, fmt.lower())
+            progress.empty()
+
+        result = st.session_state.get('export_result')
+        if result and os.path.exists(result[0]):
+            path, summary, fmt = result
+            st.caption(" • ".join(f"{table}: {count:,} rows" for table, count in summary["rows"].items()))
+            if summary["failed"]:
+                st.warning(f"Could not load {len(summary['failed'])} profiles: {', '.join(summary['failed'][:10])}")
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                with open(path, "rb") as archive:
+                    # The zip's bytes are sent with the page, so the file can go once it is clicked
+                    st.download_button(
+                        "Download export (.zip)", archive,
+                        file_name=f"codvid_export_{datetime.now():%Y%m%d_%H%M}_{fmt}.zip",
+                        mime="application/zip", key="export_download", on_click=clear_export,
+                    )
+            with col2:
+                st.button("Clear", key="export_clear", on_click=clear_export)
+
+def show_portfolio(api_client):
+    """Compare engagement, cadence and sentiment across all tracked profiles"""
+    st.markdown('<h1 class="brand-title">Portfolio Analytics</h1>', unsafe_allow_html=True)
+
+    if st.button("Back to Dashboard"):
+        st.session_state.current_page = 'dashboard'
+        st.rerun()
+
+    st.markdown("---")
+
+    tasks = api_client.get_tracking_tasks()
+    if not tasks:
+        st.info("No tracking tasks found. Create your first task from the dashboard!")
+        return
+
+    if 'portfolio_engine' not in st.session_state:
+        st.session_state.portfolio_engine = PortfolioEngine(Config.PORTFOLIO_CONFIG["max_workers"])
+    engine = st.session_state.portfolio_engine
+
+    # Only profiles rescraped since the last visit are fetched again
+    stale = engine.stale_tasks(tasks)
+    progress = st.progress(0.0, text=f"Loading {len(stale)} profiles...") if stale else None
+    metrics = engine.refresh(
+        api_client, tasks,
+        on_progress=(lambda done, total: progress.progress(done / total, text=f"Loaded {done}/{total} profiles"))
+        if progress else None,
+    )
+    if progress:
+        progress.empty()
+    if engine.failed:
+        st.warning(f"Could not load {len(engine.failed)} profiles: {', '.join(engine.failed[:10])}")
+
+    if metrics is None or metrics.empty:
+        st.info("No scraped posts yet. Scrape some profiles first.")
+        return
+
+    # Portfolio totals
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Profiles", len(metrics))
+    with col2:
+        st.metric("Posts Analyzed", f"{int(metrics['posts'].sum()):,}")
+    with col3:
+        st.metric("Avg Eng./Post", f"{metrics['engagement_per_post'].mean():,.0f}")
+    with col4:
+        st.metric("Avg Positive %", f"{metrics['pct_positive'].mean():.1f}%")
+
+    st.markdown('<h3 class="main-header">Profiles</h3>', unsafe_allow_html=True)
+    st.dataframe(
+        portfolio_table(metrics).sort_values('Eng./Post', ascending=False),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'Eng./Post': st.column_config.NumberColumn(format="%.0f"),
+            'Eng. Rate %': st.column_config.NumberColumn(format="%.2f"),
+            'Posts/Week': st.column_config.NumberColumn(format="%.1f"),
+            'Median Gap (d)': st.column_config.NumberColumn(format="%.1f"),
+            'Positive %': st.column_config.NumberColumn(format="%.1f"),
+            'Neutral %': st.column_config.NumberColumn(format="%.1f"),
+            'Negative %': st.column_config.NumberColumn(format="%.1f"),
+        },
+    )
+
+    engagement_fig, mix_fig = portfolio_figures(metrics, Config.PORTFOLIO_CONFIG["chart_profiles"])
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(engagement_fig, use_container_width=True)
+    with col2:
+        st.plotly_chart(mix_fig, use_container_width=True)
+
+    show_export(api_client)
+
+    # Jump to a profile's detail page
+    by_profile = {task.get('target_profile'): task for task in tasks}
+    selected = st.selectbox(
+        "Open profile", options=list(metrics['target_profile']), index=None, placeholder="Choose a profile..."
+    )
+    if selected and selected in by_profile:
+        st.session_state.current_profile = by_profile[selected]
+        st.session_state.current_page = 'profile_details'
+        st.rerun()
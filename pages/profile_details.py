@@ -1,9 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 from datetime import datetime
 import time
 from config import Config
+from records import SENTIMENTS, deep_sizeof
+from charts import cached_metric_history_figure, cached_post_sentiment_pie
+from post_metrics import (
+    build_post_frames, compare_sentiment_summaries, format_post_table,
+    post_sentiment_table, summarize_posts, summarize_sentiment,
+)
+from scrape_diff import comment_key, post_key
 
 def display_sentiment_analysis(sentiment_summary):
     """Display sentiment analysis with visual bars like in the notebooks"""
@@ -12,6 +17,7 @@ def display_sentiment_analysis(sentiment_summary):
         return
     
     st.markdown('<h3 class="main-header">Sentiment Analysis</h3>', unsafe_allow_html=True)
+    import plotly.express as px
     
     col1, col2 = st.columns(2)
     with col1:
@@ -48,6 +54,26 @@ def display_sentiment_analysis(sentiment_summary):
         emoji = emoji_map.get(sentiment, "😐")
         st.markdown(f"   {emoji} {sentiment.capitalize():8} |{bar}| {percentage:.1f}%")
 
+def display_scrape_changes(changes):
+    """Summary of what the latest scrape changed relative to the previous one"""
+    totals = changes.totals()
+    st.markdown('<h4 class="main-header">Since Last Scrape</h4>', unsafe_allow_html=True)
+    if changes.is_empty:
+        st.caption("No changes since the previous scrape.")
+        return
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("New Posts", totals['new_posts'])
+    with col2:
+        st.metric("Likes", f"{totals['likes']:+,}")
+    with col3:
+        st.metric("Comments", f"{totals['comments']:+,}")
+    with col4:
+        st.metric("New Top Comments", totals['new_comments'])
+    with col5:
+        st.metric("Sentiment Shifts", totals['sentiment_shifts'])
+
+
 def show_profile_details(api_client):
     """Show detailed profile information and controls"""
     if not st.session_state.current_profile:
@@ -57,6 +83,10 @@ def show_profile_details(api_client):
     
     profile = st.session_state.current_profile
     
+    # Remember recently viewed profiles so the dashboard can prefetch them
+    recent = [pid for pid in st.session_state.get('recent_profiles', []) if pid != profile['_id']]
+    st.session_state.recent_profiles = [profile['_id']] + recent[:Config.PREFETCH_CONFIG["recent_profiles"] - 1]
+    
     st.markdown(f'<h1 class="brand-title">@{profile["target_profile"]} Analytics</h1>', unsafe_allow_html=True)
     
     # Back button
@@ -115,15 +145,14 @@ def show_profile_details(api_client):
     st.markdown("---")
 
     # Always show current task status (persists across reloads)
-    current_status = api_client.get_task_status(profile['_id'])
+    current_status = api_client.get_task_status_record(profile['_id'])
     if current_status:
-        if current_status.get('is_processing'):
+        if current_status.is_processing:
             st.info("Task is processing...")
-            latest_event = current_status.get('latest_event')
-            if latest_event:
+            if current_status.latest_event_type or current_status.latest_event_ts:
                 st.caption(
-                    f"Latest: {latest_event.get('event_type', 'event')} at "
-                    f"{datetime.fromtimestamp(latest_event.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M:%S')}"
+                    f"Latest: {current_status.latest_event_type or 'event'} at "
+                    f"{datetime.fromtimestamp(current_status.latest_event_ts or 0).strftime('%Y-%m-%d %H:%M:%S')}"
                 )
         else:
             st.success("Task is idle/completed")
@@ -132,132 +161,152 @@ def show_profile_details(api_client):
 
     # Backward-compat monitor flag: if set and now completed, clear it
     if hasattr(st.session_state, 'monitor_task_id'):
-        if not (current_status and current_status.get('is_processing')):
+        if not (current_status and current_status.is_processing):
             del st.session_state.monitor_task_id
+            # A scrape just finished; cached details for this task are stale
+            api_client.invalidate_task_cache(profile['_id'])
 
-    # Get detailed task data
-    task_details = api_client.get_task_details(profile['_id'])
-    
-    # Support both 'posts', 'scraped_posts', and nested 'target_profile_data.scraped_posts'
-    posts_list = None
-    if task_details:
-        posts_list = (
-            task_details.get('posts')
-            or task_details.get('scraped_posts')
-            or task_details.get('target_profile_data', {}).get('scraped_posts')
-        )
+    # Get detailed task data (instant when prefetched from the dashboard), normalized
+    # once per scrape from whichever posts shape the backend returned
+    records = api_client.get_task_records(profile)
+    posts = records.posts if records else ()
     
-    if posts_list:
+    if posts:
         st.markdown('<h3 class="main-header">Recent Posts Analysis</h3>', unsafe_allow_html=True)
-        posts = posts_list
         
-        # Create metrics
-        def get_like_count(p):
-            return p.get('likes', p.get('likes_count', 0))
-        def get_comment_count(p):
-            return p.get('comments_count', p.get('comments', 0))
-
-        total_likes = sum(get_like_count(post) for post in posts)
-        total_comments = sum(get_comment_count(post) for post in posts)
-        avg_likes = total_likes / len(posts) if posts else 0
-        avg_comments = total_comments / len(posts) if posts else 0
+        # Normalize posts/comments into columnar frames once per scrape
+        posts_df, comments_df = api_client.get_derived_cached(
+            profile, 'post_frames', lambda: build_post_frames(posts)
+        )
+        summary = summarize_posts(posts_df)
+        
+        # Diff against the previous scrape seen this session
+        changes = api_client.get_scrape_changes(profile)
+        if changes is not None:
+            display_scrape_changes(changes)
         
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Posts", len(posts))
+            st.metric("Total Posts", summary['count'])
         with col2:
-            st.metric("Total Likes", f"{total_likes:,}")
+            st.metric("Total Likes", f"{summary['total_likes']:,}")
         with col3:
-            st.metric("Total Comments", f"{total_comments:,}")
+            st.metric("Total Comments", f"{summary['total_comments']:,}")
         with col4:
-            st.metric("Avg Likes/Post", f"{avg_likes:.0f}")
+            st.metric("Avg Likes/Post", f"{summary['avg_likes']:.0f}")
         
         # Posts table
         st.markdown('<h4 class="main-header">Recent Posts</h4>', unsafe_allow_html=True)
-        posts_data = []
-        for post in posts[:10]:  # Show last 10 posts
-            caption = post.get('caption', '')
-            if caption and len(caption) > 100:
-                caption = caption[:100] + '...'
-            posts_data.append({
-                'Caption': caption,
-                'Likes': get_like_count(post),
-                'Comments': get_comment_count(post),
-                'Date': datetime.fromtimestamp(post.get('timestamp', 0)).strftime('%Y-%m-%d') if post.get('timestamp') else 'Unknown'
-            })
-        
-        if posts_data:
-            df = pd.DataFrame(posts_data)
-            st.dataframe(df, use_container_width=True)
+        st.dataframe(format_post_table(posts_df, limit=10), use_container_width=True)
 
         # Per-post comments and sentiment details
         st.markdown('<h4 class="main-header">Comments & Sentiment (per post)</h4>', unsafe_allow_html=True)
         emoji_map = Config.SENTIMENT_CONFIG["emoji_map"]
+        sentiment_table = post_sentiment_table(comments_df, len(posts_df))
         for idx, post in enumerate(posts[:10]):
-            caption_full = post.get('caption', '') or ''
             date_str = (
-                datetime.fromtimestamp(post.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M')
-                if post.get('timestamp') else 'Unknown'
+                datetime.fromtimestamp(post.timestamp).strftime('%Y-%m-%d %H:%M')
+                if post.timestamp else 'Unknown'
             )
+            key = post_key(post, idx)
             header = f"Post {idx+1} • {date_str}"
+            delta = changes.deltas.get(key) if changes is not None else None
+            if changes is not None and key in changes.new_posts:
+                header += " • 🆕 new"
+            elif delta is not None:
+                parts = [f"{value:+,} {name}" for name, value in (("likes", delta.likes), ("comments", delta.comments)) if value]
+                if delta.new_comments or delta.sentiment_shifts:
+                    parts.append("comments updated")
+                header += " • " + (", ".join(parts) or "updated")
             with st.expander(header, expanded=False):
                 # Basic metrics
                 colm1, colm2, colm3, colm4 = st.columns(4)
                 with colm1:
-                    st.metric("Likes", f"{get_like_count(post):,}")
+                    st.metric("Likes", f"{post.likes:,}", delta=delta.likes if delta else None)
                 with colm2:
-                    st.metric("Comments", f"{get_comment_count(post):,}")
+                    st.metric("Comments", f"{post.comments:,}", delta=delta.comments if delta else None)
                 with colm3:
-                    views = post.get('video_view_count', 0)
-                    if views:
-                        st.metric("Views", f"{views:,}")
+                    if post.views:
+                        st.metric("Views", f"{post.views:,}", delta=delta.views if delta else None)
                 with colm4:
-                    st.metric("Type", post.get('type', 'Unknown'))
+                    st.metric("Type", post.type)
 
                 st.markdown("**Caption:**")
-                st.write(caption_full)
+                st.write(post.caption)
 
                 # Sentiment from top_comments
-                top_comments = post.get('top_comments', []) or []
+                top_comments = post.top_comments
+                sentiment_row = sentiment_table.iloc[idx]
                 if top_comments:
-                    counts = {"positive": 0, "negative": 0, "neutral": 0}
-                    for c in top_comments:
-                        s = (c.get('sentiment') or 'neutral').lower()
-                        if s not in counts:
-                            s = 'neutral'
-                        counts[s] += 1
-                    total = sum(counts.values()) or 1
-                    percentages = {k: (v / total) * 100 for k, v in counts.items()}
+                    counts = {s: int(sentiment_row[s]) for s in SENTIMENTS}
 
                     colc1, colc2 = st.columns([1, 1])
                     with colc1:
                         st.markdown("**Sentiment Summary:**")
-                        for s in ["positive", "neutral", "negative"]:
+                        for s in SENTIMENTS:
                             emoji = emoji_map.get(s, "😐")
-                            st.markdown(f"{emoji} {s.capitalize()}: {counts[s]} ({percentages[s]:.1f}%)")
+                            st.markdown(f"{emoji} {s.capitalize()}: {counts[s]} ({sentiment_row[f'pct_{s}']:.1f}%)")
                     with colc2:
-                        try:
-                            fig = px.pie(values=list(counts.values()), names=list(counts.keys()), title="Sentiment")
-                            st.plotly_chart(fig, use_container_width=True)
-                        except Exception:
-                            pass
+                        # Expander bodies always execute, so the chart is opt-in and
+                        # only rebuilt when the post's sentiment counts change
+                        if st.toggle("Show chart", key=f"post_pie_{profile['_id']}_{idx}"):
+                            try:
+                                fig = cached_post_sentiment_pie(profile['_id'], key, counts)
+                                st.plotly_chart(fig, use_container_width=True)
+                            except Exception:
+                                pass
 
+                    # Keyed by content, so badges survive the records being rebuilt
+                    new_comments = {comment_key(c) for c in delta.new_comments} if delta else set()
+                    shifted = {comment_key(c): old for c, old in delta.sentiment_shifts} if delta else {}
                     st.markdown("**Top Comments:**")
                     for c in top_comments:
-                        s = (c.get('sentiment') or 'neutral').lower()
-                        emoji = emoji_map.get(s, "😐")
-                        username = c.get('owner_username', 'unknown')
-                        text = c.get('text', '')
-                        likes = c.get('likes_count', 0)
-                        ts = c.get('timestamp')
-                        ts_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M') if ts else 'Unknown'
-                        st.markdown(f"{emoji} **@{username}** ({ts_str})  |  {likes} likes\n\n{text}")
+                        emoji = emoji_map.get(c.sentiment, "😐")
+                        ts_str = datetime.fromtimestamp(c.timestamp).strftime('%Y-%m-%d %H:%M') if c.timestamp else 'Unknown'
+                        ckey = comment_key(c)
+                        badge = " 🆕" if ckey in new_comments else ""
+                        if ckey in shifted:
+                            badge = f" (was {shifted[ckey]})"
+                        st.markdown(f"{emoji} **@{c.owner_username}**{badge} ({ts_str})  |  {c.likes} likes\n\n{c.text}")
                 else:
                     st.info("No top comments available for this post.")
         
-        # Sentiment analysis with improved visualization
-        sentiment_summary = api_client.get_sentiment_summary(profile['_id'])
+        # Locally recorded history across scrapes
+        history = api_client.get_metric_history(profile['_id'])
+        if history is not None and len(history['ts']) >= 2:
+            st.markdown('<h4 class="main-header">Growth Over Time</h4>', unsafe_allow_html=True)
+            st.plotly_chart(
+                cached_metric_history_figure(profile['_id'], history, title="Totals across recent posts"),
+                use_container_width=True,
+            )
+        
+        # Normalized vs raw payload footprint (debug only)
+        if st.session_state.get('debug_mode'):
+            raw_bytes = deep_sizeof(api_client.get_task_details_cached(profile))
+            records_bytes = deep_sizeof(records)
+            st.caption(
+                f"Payload memory: raw {raw_bytes / 1024:,.0f} KB, "
+                f"normalized records {records_bytes / 1024:,.0f} KB"
+            )
+        
+        # Sentiment analysis with improved visualization. The top comments are
+        # already in the payload, so aggregate them locally rather than making
+        # another round trip; debug mode cross-checks against the endpoint.
+        if Config.SENTIMENT_CONFIG["local_summary"]:
+            sentiment_summary = api_client.get_derived_cached(
+                profile, 'sentiment_summary_local', lambda: summarize_sentiment(comments_df)
+            )
+            if st.session_state.get('debug_mode'):
+                server_summary = api_client.get_sentiment_summary_cached(profile)
+                if server_summary:
+                    diffs = compare_sentiment_summaries(sentiment_summary, server_summary)
+                    if diffs:
+                        st.warning("Local vs server sentiment summary differ: " + "; ".join(diffs))
+                    else:
+                        st.caption("Local sentiment summary matches the server.")
+        else:
+            sentiment_summary = api_client.get_sentiment_summary_cached(profile)
         if sentiment_summary:
             display_sentiment_analysis(sentiment_summary)
     else:
@@ -1,6 +1,201 @@
 import streamlit as st
 import json
+import re
+import time
 from datetime import datetime
+from config import Config
+from chat_index import message_text
+from chat_stream import INTERRUPTED
+
+def render_message(message, highlight=False):
+    """Render one chat message (user/assistant bubbles, event and tool expanders)"""
+    role = message.get('role')
+    mtype = message.get('type')
+    content = message.get('content') or message.get('text') or ''
+    if highlight:
+        st.caption("🔎 Search match")
+
+    # Event messages as collapsible dropdowns
+    if mtype == 'event':
+        event_type = message.get('event_type', 'event')
+        with st.expander(f"**{event_type}**", expanded=highlight):
+            st.markdown(f"**Event Type:** {event_type}")
+            st.markdown(f"**Content:** {content}")
+            
+            # Show additional event data if available
+            if message.get('options'):
+                st.markdown("**Options:**")
+                for opt in message.get('options', []):
+                    st.markdown(f"- `{opt}`")
+            
+            # Show raw message data for debugging
+            st.markdown("**Raw Data:**")
+            st.json(message)
+
+    # Tool messages as collapsible dropdowns
+    elif role == 'tool':
+        with st.expander(f"**Tool: {content[:50]}...**", expanded=highlight):
+            st.markdown(f"**Tool Output:**")
+            st.markdown(f"```json\n{content}\n```")
+            
+            # Try to parse and display JSON nicely
+            try:
+                parsed = json.loads(content)
+                st.markdown("**Parsed Data:**")
+                st.json(parsed)
+            except:
+                st.markdown("**Raw Content:**")
+                st.text(content)
+
+    # Standard role-based rendering with exact styling from image
+    elif role == 'user':
+        # User messages on the right with softer dark background and timestamp (matching AI style)
+        current_time = datetime.now().strftime("%I:%M %p")  # Format like "11:52 PM"
+        border = "2px solid #F59E0B" if highlight else "1px solid #4B5563"
+        st.markdown(
+            f'<div style="text-align: right; margin: 8px 0;">'
+            f'<div style="display: inline-block; background-color: #374151; color: white; '
+            f'padding: 10px 15px; border-radius: 15px; max-width: 70%; text-align: left; '
+            f'border: {border};">'
+            f'<strong>YOU</strong><br>'
+            f'<small style="color: #D1D5DB;">{current_time}</small><br>'
+            f'{content}</div>'
+            f'</div>', 
+            unsafe_allow_html=True
+        )
+    elif role == 'assistant':
+        # AI messages on the left with light grey background and timestamp
+        current_time = datetime.now().strftime("%I:%M %p")  # Format like "11:52 PM"
+        border = "2px solid #F59E0B" if highlight else "1px solid #E5E7EB"
+        st.markdown(
+            f'<div style="text-align: left; margin: 8px 0;">'
+            f'<div style="display: inline-block; background-color: #F3F4F6; color: #111827; '
+            f'padding: 10px 15px; border-radius: 15px; max-width: 70%; border: {border};">'
+            f'<strong>AI ASSISTANT</strong><br>'
+            f'<small style="color: #6B7280;">{current_time}</small><br>'
+            f'{content}</div>'
+            f'</div>', 
+            unsafe_allow_html=True
+        )
+    else:
+        st.markdown(f"**{role or 'system'}:** {content}")
+
+def chat_window(project, total):
+    """(start, end) of the messages to render; the window follows the latest message unless moved"""
+    size = Config.CHAT_CONFIG["window_messages"]
+    end = st.session_state.get(f"chat_window:{project}")
+    end = total if end is None else max(min(end, total), min(size, total))
+    return max(0, end - size), end
+
+def move_chat_window(project, end, total, highlight=None):
+    st.session_state[f"chat_window:{project}"] = None if end >= total else end
+    st.session_state[f"chat_highlight:{project}"] = highlight
+
+def show_window_controls(project, start, end, total, position):
+    """Earlier / later / latest buttons around the rendered window"""
+    if total <= Config.CHAT_CONFIG["window_messages"]:
+        return
+    size = Config.CHAT_CONFIG["window_messages"]
+    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    with col1:
+        st.caption(f"Messages {start + 1:,}–{end:,} of {total:,}")
+    with col2:
+        st.button("Earlier", key=f"chat_earlier_{position}", disabled=start == 0, use_container_width=True,
+                  on_click=move_chat_window, args=(project, max(end - size, size), total))
+    with col3:
+        st.button("Later", key=f"chat_later_{position}", disabled=end >= total, use_container_width=True,
+                  on_click=move_chat_window, args=(project, end + size, total))
+    with col4:
+        st.button("Latest", key=f"chat_latest_{position}", disabled=end >= total, use_container_width=True,
+                  on_click=move_chat_window, args=(project, total, total))
+
+def snippet(text, query, width=80):
+    """A short excerpt of ``text`` around the first query word"""
+    text = " ".join(text.split())
+    match = None
+    for word in query.split():
+        match = re.search(re.escape(word), text, re.IGNORECASE)
+        if match:
+            break
+    start = max(0, (match.start() if match else 0) - width // 3)
+    excerpt = text[start:start + width]
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
+
+def show_chat_search(api_client, project, messages):
+    """Search box over the project's history; picking a match moves the window to it"""
+    query = st.text_input("Search this chat", placeholder="Search messages...", key=f"chat_search:{project}")
+    if not query.strip() or api_client.chat_index is None:
+        return
+    if project not in api_client.chat_index:
+        with st.spinner(f"Indexing {len(messages):,} messages..."):
+            api_client.chat_index.sync(project, messages)
+    started = time.perf_counter()
+    # Only messages added since the last search are tokenized
+    api_client.chat_index.sync(project, messages)
+    positions, total = api_client.chat_index.search(project, query, Config.CHAT_CONFIG["search_results"])
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if not positions:
+        st.caption(f"No messages match • {elapsed_ms:.0f} ms")
+        return
+    st.caption(f"{total:,} matching messages • newest {len(positions)} shown • {elapsed_ms:.0f} ms")
+    size = Config.CHAT_CONFIG["window_messages"]
+    key = f"chat_search_jump:{project}"
+
+    def jump():
+        position = st.session_state.get(key)
+        if position is not None:
+            # Center the window on the match
+            move_chat_window(project, max(position + size // 2 + 1, size), len(messages), position)
+
+    st.selectbox(
+        "Jump to match", options=positions, index=None, placeholder="Jump to a match...", key=key,
+        format_func=lambda i: f"#{i + 1} {messages[i].get('role') or 'system'}: {snippet(message_text(messages[i]), query)}",
+        on_change=jump, label_visibility="collapsed",
+    )
+
+def show_streaming_reply(project, shown_reply):
+    """The reply streaming into ``project`` and the messages queued behind it.
+
+    Re-renders the page once the reply shown at page build lands or the
+    queue dispatches the next message, so both reach the history.
+    """
+    streams = st.session_state.chat_streams
+    reply = streams.get(project)
+    if reply is not shown_reply or (shown_reply is not None and shown_reply.running and not reply.running):
+        st.rerun()
+    if reply is not None:
+        if reply.running:
+            render_message({'role': 'assistant', 'type': 'text', 'text': reply.text or "…"})
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                st.caption(f"AI is replying... {time.time() - reply.started_at:.0f}s")
+            with col2:
+                st.button("Stop", key=f"chat_stop_{project}", disabled=reply.stop_requested,
+                          on_click=streams.stop, args=(project,), use_container_width=True)
+        elif reply.state in INTERRUPTED:
+            # Partial text stays here only; the history resyncs from the server
+            if reply.text:
+                render_message({'role': 'assistant', 'type': 'text', 'text': reply.text})
+            st.warning(reply.error)
+        elif reply.state == "failed":
+            st.error(reply.error or "Failed to get AI response")
+
+    # Queued follow-ups, sent in order once the reply above finishes
+    for item in streams.pending(project):
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(
+                f'<div style="text-align: right; margin: 8px 0; opacity: 0.6;">'
+                f'<div style="display: inline-block; background-color: #374151; color: white; '
+                f'padding: 10px 15px; border-radius: 15px; max-width: 70%; text-align: left; '
+                f'border: 1px dashed #9CA3AF;">'
+                f'<strong>YOU</strong> <small style="color: #D1D5DB;">queued</small><br>'
+                f'{item.text}</div>'
+                f'</div>',
+                unsafe_allow_html=True
+            )
+        with col2:
+            st.button("Cancel", key=f"chat_cancel_{item.id}", on_click=streams.cancel, args=(project, item.id))
 
 def show_project_chat(api_client):
     """Show project chat interface matching the exact UI from the image"""
@@ -22,6 +217,12 @@ def show_project_chat(api_client):
             
             # Try to get existing chat data from project data if available
             try:
+                # Refetch the full history only when the server's mod_count has moved
+                if api_client.check_and_reload_project_data(project):
+                    project_data = st.session_state.local_user_data["projects"].get(project)
+                    if isinstance(project_data, dict) and not isinstance(project_data.get("chats"), list):
+                        project_data["chats"] = project_data.get("chat_history") if isinstance(project_data.get("chat_history"), list) else []
+                    return
                 project_data = api_client.get_project_data(project)
                 if project_data and isinstance(project_data, dict):
                     # Check if project data contains chat history
@@ -72,6 +273,11 @@ def show_project_chat(api_client):
                 label_visibility="collapsed"
             )
         
+        # Replies keep streaming into other projects while this one is shown
+        others = [p for p in st.session_state.chat_streams.streaming() if p != project]
+        if others:
+            st.caption(f"AI is replying in: {', '.join(others)}")
+        
         # Handle project selection change
         if 'selected_project' in locals() and selected_project != project:
             st.session_state.current_project = selected_project
@@ -224,79 +430,25 @@ def show_project_chat(api_client):
         if not messages_src:
             st.info("No messages yet. Start a conversation!")
         else:
-            for i, message in enumerate(messages_src):
-                role = message.get('role')
-                mtype = message.get('type')
-                content = message.get('content') or message.get('text') or ''
-
-                # Event messages as collapsible dropdowns
-                if mtype == 'event':
-                    event_type = message.get('event_type', 'event')
-                    with st.expander(f"**{event_type}**", expanded=False):
-                        st.markdown(f"**Event Type:** {event_type}")
-                        st.markdown(f"**Content:** {content}")
-                        
-                        # Show additional event data if available
-                        if message.get('options'):
-                            st.markdown("**Options:**")
-                            for opt in message.get('options', []):
-                                st.markdown(f"- `{opt}`")
-                        
-                        # Show raw message data for debugging
-                        st.markdown("**Raw Data:**")
-                        st.json(message)
-
-                # Tool messages as collapsible dropdowns
-                elif role == 'tool':
-                    with st.expander(f"**Tool: {content[:50]}...**", expanded=False):
-                        st.markdown(f"**Tool Output:**")
-                        st.markdown(f"```json\n{content}\n```")
-                        
-                        # Try to parse and display JSON nicely
-                        try:
-                            parsed = json.loads(content)
-                            st.markdown("**Parsed Data:**")
-                            st.json(parsed)
-                        except:
-                            st.markdown("**Raw Content:**")
-                            st.text(content)
-
-                # Standard role-based rendering with exact styling from image
-                elif role == 'user':
-                    # User messages on the right with softer dark background and timestamp (matching AI style)
-                    current_time = datetime.now().strftime("%I:%M %p")  # Format like "11:52 PM"
-                    st.markdown(
-                        f'<div style="text-align: right; margin: 8px 0;">'
-                        f'<div style="display: inline-block; background-color: #374151; color: white; '
-                        f'padding: 10px 15px; border-radius: 15px; max-width: 70%; text-align: left; '
-                        f'border: 1px solid #4B5563;">'
-                        f'<strong>YOU</strong><br>'
-                        f'<small style="color: #D1D5DB;">{current_time}</small><br>'
-                        f'{content}</div>'
-                        f'</div>', 
-                        unsafe_allow_html=True
-                    )
-                elif role == 'assistant':
-                    # AI messages on the left with light grey background and timestamp
-                    current_time = datetime.now().strftime("%I:%M %p")  # Format like "11:52 PM"
-                    st.markdown(
-                        f'<div style="text-align: left; margin: 8px 0;">'
-                        f'<div style="display: inline-block; background-color: #F3F4F6; color: #111827; '
-                        f'padding: 10px 15px; border-radius: 15px; max-width: 70%; border: 1px solid #E5E7EB;">'
-                        f'<strong>AI ASSISTANT</strong><br>'
-                        f'<small style="color: #6B7280;">{current_time}</small><br>'
-                        f'{content}</div>'
-                        f'</div>', 
-                        unsafe_allow_html=True
-                    )
-                else:
-                    st.markdown(f"**{role or 'system'}:** {content}")
+            show_chat_search(api_client, project, messages_src)
+            start, end = chat_window(project, len(messages_src))
+            highlight = st.session_state.get(f"chat_highlight:{project}")
+            show_window_controls(project, start, end, len(messages_src), "top")
+            for i in range(start, end):
+                render_message(messages_src[i], highlight=(i == highlight))
 
                 # Minimal spacing between messages (no horizontal lines)
-                if i < len(messages_src) - 1:
+                if i < end - 1:
                     st.markdown('<div style="height: 8px;"></div>', unsafe_allow_html=True)
+            show_window_controls(project, start, end, len(messages_src), "bottom")
     
         # Close chat grid container (Streamlit container closes automatically)
+
+    # In-flight reply and queued messages, polled while the project is busy
+    streams = st.session_state.chat_streams
+    reply = streams.get(project)
+    busy = (reply is not None and reply.running) or bool(streams.pending(project))
+    st.fragment(run_every=Config.CHAT_CONFIG["poll_seconds"] if busy else None)(show_streaming_reply)(project, reply)
     
     # Fixed bottom input area - always visible at bottom
     
@@ -328,72 +480,11 @@ def show_project_chat(api_client):
             else:
                 combined_message = message
             
-            # Add user message to local cache and fallback history
-            try:
-                st.session_state.local_user_data["projects"][project]["chats"].append({
-                    'role': 'user', 'type': 'text', 'text': combined_message
-                })
-            except Exception:
-                st.session_state.chat_history.append({'role': 'user', 'text': combined_message})
+            # Show the newest messages again after sending
+            move_chat_window(project, 0, 0)
 
-            # Get AI response (streaming)
-            with st.spinner("AI is thinking..."):
-                streaming_response = api_client.ai_chat(project, combined_message)
-                
-                if streaming_response:
-                    # Create a placeholder for the streaming AI response
-                    ai_message_placeholder = st.empty()
-                    
-                    # Process streaming response in real-time
-                    aggregated_text = ""
-                    assistant_message_added_via_mods = False
-                    
-                    try:
-                        for text_chunk, is_final, data_mods in api_client.process_streaming_response(streaming_response, project):
-                            if text_chunk:
-                                aggregated_text += text_chunk
-                                # Update the placeholder in real-time
-                                ai_message_placeholder.markdown(f"**AI:** {aggregated_text}")
-                            
-                            # Check if this was added via data_mods
-                            if data_mods and not assistant_message_added_via_mods:
-                                for mod in data_mods:
-                                    try:
-                                        key_path = mod.get("key_path")
-                                        mode = mod.get("mode")
-                                        value = mod.get("value")
-                                        if (
-                                            isinstance(key_path, list)
-                                            and len(key_path) >= 3
-                                            and key_path[-2] == project
-                                            and key_path[-1] == "chats"
-                                            and mode in ("append", "create")
-                                        ):
-                                            messages = value if isinstance(value, list) else [value]
-                                            for m in messages:
-                                                if isinstance(m, dict) and m.get("role") == "assistant":
-                                                    assistant_message_added_via_mods = True
-                                                    break
-                                    except Exception:
-                                        continue
-                            
-                            # If final, break the loop
-                            if is_final:
-                                break
-                        
-                        # Add the complete AI response to chat history if not already added via data_mods
-                        if aggregated_text and not assistant_message_added_via_mods:
-                            try:
-                                st.session_state.local_user_data["projects"][project]["chats"].append({
-                                    'role': 'assistant', 'type': 'text', 'text': aggregated_text
-                                })
-                            except Exception:
-                                st.session_state.chat_history.append({'role': 'assistant', 'text': aggregated_text})
-                                
-                    except Exception as e:
-                        st.error(f"Error processing streaming response: {e}")
-                else:
-                    st.error("Failed to get AI response")
+            # Queued behind any reply still streaming; it joins the history when dispatched
+            st.session_state.chat_streams.send(api_client, project, combined_message)
 
             st.rerun()
     
@@ -1,9 +1,132 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import time
 from datetime import datetime
+from config import Config
+from charts import (
+    REEL_METRICS,
+    cached_metric_history_figure,
+    cached_reel_performance_figure,
+    cached_reel_scatter_figure,
+    cached_reel_top_n_figure,
+    reel_performance_frame,
+)
+from scrape_orchestrator import start_scrape_run
+from task_import import import_reels, parse_reel_urls
+
+def show_reel_status(status):
+    """Render a reel task's processing status"""
+    if status:
+        if status.is_processing:
+            st.info("Reel task is processing...")
+            if status.latest_event_type or status.latest_event_ts:
+                st.caption(
+                    f"Latest: {status.latest_event_type or 'event'} at "
+                    f"{datetime.fromtimestamp(status.latest_event_ts or 0).strftime('%Y-%m-%d %H:%M:%S')}"
+                )
+        else:
+            st.success("Reel task is idle/completed")
+    else:
+        st.warning("Unable to fetch reel task status.")
+
+def show_scalable_reel_performance(performance_rows):
+    """Top-N chart, overview scatter and searchable table for large reel campaigns"""
+    st.caption(f"{len(performance_rows)} reels with data. Showing top reels and an overview.")
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        metric = st.selectbox("Rank reels by", options=list(REEL_METRICS), index=2, key="reel_rank_metric")
+    with col2:
+        top_n = st.slider(
+            "Reels to show", min_value=5, max_value=50,
+            value=Config.CHART_CONFIG["reel_top_n"], step=5, key="reel_top_n"
+        )
+    st.plotly_chart(cached_reel_top_n_figure(performance_rows, metric, top_n), use_container_width=True)
+    st.plotly_chart(cached_reel_scatter_figure(performance_rows), use_container_width=True)
+
+    # Table columns are sortable by clicking their headers
+    search = st.text_input("Search reels", placeholder="Reel ID contains...", key="reel_table_search")
+    df = reel_performance_frame(performance_rows)
+    if search:
+        df = df[df['Reel ID'].str.contains(search, case=False, regex=False)]
+    st.dataframe(df.sort_values(metric, ascending=False), use_container_width=True, hide_index=True)
+
+def show_bulk_reel_import(api_client, project, reel_tasks):
+    """Paste or upload many reel URLs; validated and deduplicated before any request"""
+    with st.expander("Bulk Add Reels", expanded=False):
+        uploaded = st.file_uploader("Upload a list of reel URLs", type=["txt", "csv"], key="bulk_reel_file")
+        pasted = st.text_area(
+            "Or paste reel URLs (one per line)",
+            placeholder="https://www.instagram.com/reel/...",
+            key="bulk_reel_text",
+        )
+        interval = st.number_input(
+            "Scrape Interval (days)", min_value=0.5, max_value=30.0, value=2.0, step=0.5,
+            key="bulk_reel_interval"
+        )
+        text = uploaded.getvalue().decode("utf-8", errors="replace") if uploaded else (pasted or "")
+        rows = parse_reel_urls(text, (task.reel_url for task in reel_tasks)) if text.strip() else []
+        pending = [row for row in rows if row.status == "pending"]
+        max_rows = Config.IMPORT_CONFIG["max_rows"]
+        if rows:
+            st.caption(f"{len(pending)} to add, {len(rows) - len(pending)} skipped (duplicates or invalid)")
+        if len(pending) > max_rows:
+            st.error(f"At most {max_rows} reels per import.")
+        elif pending and st.button(f"Add {len(pending)} reels", type="primary", key="bulk_reel_run"):
+            progress = st.progress(0.0, text=f"Adding {len(pending)} reels...")
+            import_reels(
+                api_client, project, rows, interval,
+                on_progress=lambda done, total, row, ok: progress.progress(
+                    done / total, text=f"{done}/{total} • {row.shortcode} {'added' if ok else 'failed'}"
+                ),
+            )
+            added = sum(row.status == "created" for row in rows)
+            st.session_state.bulk_reel_report = [row.as_dict() for row in rows]
+            st.session_state.bulk_reel_summary = f"Added {added} of {len(pending)} reels to {project}."
+            st.rerun()
+
+        report = st.session_state.get('bulk_reel_report')
+        if report:
+            st.success(st.session_state.get('bulk_reel_summary', ""))
+            st.dataframe(report, use_container_width=True, hide_index=True)
+            if st.button("Clear report", key="bulk_reel_clear"):
+                del st.session_state.bulk_reel_report
+                st.rerun()
+        elif rows:
+            st.dataframe([row.as_dict() for row in rows], use_container_width=True, hide_index=True)
+
+def show_bulk_reel_scrape(api_client, project, reel_tasks):
+    """Force scrape every reel in the project, a few at a time, tracked in the background"""
+    key = f"bulk_reel_scrape_run:{project}"
+    run = st.session_state.get(key)
+    with st.expander("Scrape All Reels", expanded=bool(run and run.running)):
+        if run is None or not run.running:
+            st.caption(
+                f"At most {Config.SCRAPE_CONFIG['max_concurrent_scrapes']} scrapes run at once; "
+                "reels already being scraped are skipped."
+            )
+            if st.button(f"Scrape {len(reel_tasks)} reels", type="primary", key="bulk_reel_scrape_start"):
+                st.session_state[key] = start_scrape_run(
+                    api_client, [(task.task_id, task.reel_id or task.task_id) for task in reel_tasks], reel=True
+                )
+                st.rerun()
+        if run is not None:
+            # New results show once finished scrapes are reflected in the reel list
+            if run.finished != st.session_state.get(f"{key}:seen"):
+                st.session_state[f"{key}:seen"] = run.finished
+                api_client.invalidate_list_cache(f"reels:{project}")
+            st.progress(run.finished / max(1, len(run.jobs)), text=run.summary())
+            st.dataframe([job.as_dict() for job in run.jobs], use_container_width=True, hide_index=True)
+            col_refresh, col_stop = st.columns(2)
+            with col_refresh:
+                if st.button("Refresh", key="bulk_reel_scrape_refresh", use_container_width=True):
+                    st.rerun()
+            with col_stop:
+                if run.running:
+                    if st.button("Stop queued scrapes", key="bulk_reel_scrape_cancel", use_container_width=True):
+                        run.cancel()
+                        st.rerun()
+                elif st.button("Clear", key="bulk_reel_scrape_clear", use_container_width=True):
+                    del st.session_state[key]
+                    st.rerun()
 
 def show_project_tracker(api_client):
     """Show project reel tracking interface"""
@@ -93,23 +216,22 @@ def show_project_tracker(api_client):
     
     st.markdown("---")
 
-    # Load existing reel tasks once for the page
-    reel_tasks = api_client.get_project_reel_tasks(project)
+    # Load existing reel tasks once for the page, normalized into snapshots
+    reel_tasks = api_client.get_reel_snapshots(project)
 
     # Always-visible status panel at the top
     st.markdown('<h3 class="main-header">Current Reel Task Status</h3>', unsafe_allow_html=True)
     selected_task_id = st.session_state.get('monitor_reel_task_id')
     # If nothing selected yet, default to first task if available
     if not selected_task_id and reel_tasks:
-        selected_task_id = reel_tasks[0].get('_id')
+        selected_task_id = reel_tasks[0].task_id
         st.session_state.monitor_reel_task_id = selected_task_id
 
     if reel_tasks:
         # Allow user to pick which task to monitor
         id_to_label = {}
         for t in reel_tasks:
-            label = f"{t.get('reel_id','Unknown')}"
-            id_to_label[t['_id']] = label
+            id_to_label[t.task_id] = t.reel_id
         labels = list(id_to_label.values())
         ids = list(id_to_label.keys())
         # Map current selection index
@@ -126,20 +248,7 @@ def show_project_tracker(api_client):
                 break
 
         # Show status
-        status = api_client.get_task_status(selected_task_id)
-        if status:
-            if status.get('is_processing'):
-                st.info("Reel task is processing...")
-                latest_event = status.get('latest_event')
-                if latest_event:
-                    st.caption(
-                        f"Latest: {latest_event.get('event_type', 'event')} at "
-                        f"{datetime.fromtimestamp(latest_event.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M:%S')}"
-                    )
-            else:
-                st.success("Reel task is idle/completed")
-        else:
-            st.warning("Unable to fetch reel task status.")
+        show_reel_status(api_client.get_task_status_record(selected_task_id))
     else:
         st.caption("No reel tasks yet.")
 
@@ -181,6 +290,10 @@ def show_project_tracker(api_client):
                 else:
                     st.error("Please enter a reel URL")
     
+    show_bulk_reel_import(api_client, project, reel_tasks)
+    if reel_tasks:
+        show_bulk_reel_scrape(api_client, project, reel_tasks)
+    
     # Display existing reel tasks
     st.markdown('<h3 class="main-header">Tracked Reels</h3>', unsafe_allow_html=True)
 
@@ -188,6 +301,8 @@ def show_project_tracker(api_client):
         st.info("No reels are being tracked. Add your first reel above!")
     else:
         st.markdown(f"**Total tracked reels:** {len(reel_tasks)}")
+        # One concurrent round of status lookups instead of one request per reel below
+        reel_statuses = api_client.get_task_status_records([task.task_id for task in reel_tasks])
         
         for task in reel_tasks:
             with st.container():
@@ -196,22 +311,22 @@ def show_project_tracker(api_client):
                 # Reel info
                 col1, col2 = st.columns([3, 1])
                 with col1:
-                    st.markdown(f"**Reel ID:** {task.get('reel_id', 'N/A')}")
-                    st.caption(f"**URL:** {task.get('reel_url', 'N/A')}")
+                    st.markdown(f"**Reel ID:** {task.reel_id}")
+                    st.caption(f"**URL:** {task.reel_url or 'N/A'}")
                     
                     # Show current interval
-                    current_interval = task.get('scrape_interval_days', 2)
+                    current_interval = task.scrape_interval_days
                     st.caption(f"**Current interval:** {current_interval} days")
                     
                     # Show last scraped
-                    if task.get('last_scraped'):
-                        last_scraped = datetime.fromtimestamp(task['last_scraped'])
+                    if task.last_scraped:
+                        last_scraped = datetime.fromtimestamp(task.last_scraped)
                         st.caption(f"**Last scraped:** {last_scraped.strftime('%Y-%m-%d %H:%M')}")
 
                     # Show live processing status for this task
                     try:
-                        t_status = api_client.get_task_status(task['_id'])
-                        if t_status and t_status.get('is_processing'):
+                        t_status = reel_statuses.get(task.task_id)
+                        if t_status and t_status.is_processing:
                             st.caption("Status: processing")
                         else:
                             st.caption("Status: idle")
@@ -220,39 +335,37 @@ def show_project_tracker(api_client):
                 
                 with col2:
                     # Actions
-                    if st.button("Force Scrape", key=f"force_scrape_reel_{task['_id']}"):
+                    if st.button("Force Scrape", key=f"force_scrape_reel_{task.task_id}"):
                         with st.spinner("Starting reel scrape in background..."):
-                            if api_client.force_scrape_reel_task(task['_id']):
+                            if api_client.force_scrape_reel_task(task.task_id):
                                 st.success("Scraping initiated! Monitoring status...")
-                                st.session_state.monitor_reel_task_id = task['_id']
+                                st.session_state.monitor_reel_task_id = task.task_id
                             else:
                                 st.error("Failed to scrape")
                     
-                    if st.button("Update Interval", key=f"update_reel_interval_{task['_id']}"):
-                        st.session_state.editing_reel_task_id = task['_id']
+                    if st.button("Update Interval", key=f"update_reel_interval_{task.task_id}"):
+                        st.session_state.editing_reel_task_id = task.task_id
                         st.session_state.editing_reel_current_interval = current_interval
                         st.rerun()
                     
-                    if st.button("Delete", key=f"delete_reel_{task['_id']}"):
-                        if hasattr(api_client, 'delete_reel_task') and api_client.delete_reel_task(task['_id']):
+                    if st.button("Delete", key=f"delete_reel_{task.task_id}"):
+                        if hasattr(api_client, 'delete_reel_task') and api_client.delete_reel_task(task.task_id):
                             st.success("Reel task deleted!")
                             st.rerun()
                         else:
                             st.error("Failed to delete reel task")
                 
                 # Show reel data if available
-                reel_data = task.get('reel_data', {})
-                if reel_data:
+                if task.has_data:
                     col1, col2, col3, col4 = st.columns(4)
                     with col1:
-                        st.metric("Likes", f"{reel_data.get('likes', 0):,}")
+                        st.metric("Likes", f"{task.likes:,}")
                     with col2:
-                        st.metric("Comments", f"{reel_data.get('comments', 0):,}")
+                        st.metric("Comments", f"{task.comments:,}")
                     with col3:
-                        st.metric("Views", f"{reel_data.get('views', 0):,}")
+                        st.metric("Views", f"{task.views:,}")
                     with col4:
-                        sentiment = reel_data.get('sentiment_analysis', {}).get('overall_sentiment', 'neutral')
-                        st.metric("Sentiment", sentiment.title())
+                        st.metric("Sentiment", task.overall_sentiment.title())
         
         # Interval update form for reels
         if hasattr(st.session_state, 'editing_reel_task_id'):
@@ -288,43 +401,28 @@ def show_project_tracker(api_client):
         if reel_tasks:
             st.markdown('<h4 class="main-header">Reel Performance</h4>', unsafe_allow_html=True)
             
-            # Create performance chart
-            performance_data = []
-            for task in reel_tasks:
-                if task.get('reel_data'):
-                    reel_data = task['reel_data']
-                    performance_data.append({
-                        'Reel ID': task.get('reel_id', 'Unknown'),
-                        'Likes': reel_data.get('likes', 0),
-                        'Comments': reel_data.get('comments', 0),
-                        'Views': reel_data.get('views', 0)
-                    })
+            # Create performance chart; the figure is memoized on a hash of the
+            # reel metrics so unchanged data skips construction entirely
+            performance_rows = tuple(
+                (task.reel_id, task.likes, task.comments, task.views)
+                for task in reel_tasks if task.has_data
+            )
             
-            if performance_data:
-                df = pd.DataFrame(performance_data)
-                
-                # Create performance chart
-                fig = make_subplots(
-                    rows=1, cols=3,
-                    subplot_titles=('Likes', 'Comments', 'Views'),
-                    specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
-                )
-                
-                fig.add_trace(
-                    go.Bar(x=df['Reel ID'], y=df['Likes'], name='Likes'),
-                    row=1, col=1
-                )
-                fig.add_trace(
-                    go.Bar(x=df['Reel ID'], y=df['Comments'], name='Comments'),
-                    row=1, col=2
-                )
-                fig.add_trace(
-                    go.Bar(x=df['Reel ID'], y=df['Views'], name='Views'),
-                    row=1, col=3
-                )
-                
-                fig.update_layout(height=400, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True) 
+            if len(performance_rows) > Config.CHART_CONFIG["reel_bar_limit"]:
+                show_scalable_reel_performance(performance_rows)
+            elif performance_rows:
+                fig = cached_reel_performance_figure(performance_rows)
+                st.plotly_chart(fig, use_container_width=True)
+            
+            # Growth of the currently monitored reel, from the local snapshot store
+            monitored_id = st.session_state.get('monitor_reel_task_id')
+            history = api_client.get_metric_history(monitored_id) if monitored_id else None
+            if history is not None and len(history['ts']) >= 2:
+                reel_label = next((t.reel_id for t in reel_tasks if t.task_id == monitored_id), monitored_id)
+                st.plotly_chart(
+                    cached_metric_history_figure(monitored_id, history, title=f"Reel {reel_label} over time"),
+                    use_container_width=True,
+                ) 
 
     # Live reel task status monitor (always visible if a task is selected)
     st.markdown("---")
@@ -332,19 +430,13 @@ def show_project_tracker(api_client):
     selected_task_id = st.session_state.get('monitor_reel_task_id')
     if not selected_task_id and reel_tasks:
         # Default to first task to show status
-        selected_task_id = reel_tasks[0].get('_id')
+        selected_task_id = reel_tasks[0].task_id
     if selected_task_id:
-        status = api_client.get_task_status(selected_task_id)
-        if status:
-            if status.get('is_processing'):
-                st.info("Reel task is processing...")
-                latest_event = status.get('latest_event')
-                if latest_event:
-                    st.caption(
-                        f"Latest: {latest_event.get('event_type', 'event')} at "
-                        f"{datetime.fromtimestamp(latest_event.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M:%S')}"
-                    )
-            else:
-                st.success("Reel task is idle/completed")
-        else:
-            st.warning("Unable to fetch reel task status.")
\ No newline at end of file
+        status = api_client.get_task_status_record(selected_task_id)
+        show_reel_status(status)
+        # A monitored scrape just finished: drop the cached reel list so the new data shows
+        was_processing = st.session_state.get('reel_monitor_processing')
+        st.session_state.reel_monitor_processing = bool(status and status.is_processing)
+        if was_processing and not st.session_state.reel_monitor_processing:
+            api_client.invalidate_list_cache(f"reels:{project}")
+            st.rerun()
\ No newline at end of file
@@ -1,4 +1,29 @@
 import streamlit as st
+from config import Config
+from bulk_ops import run_bulk
+
+def bulk_delete_projects(api_client, projects):
+    """Delete projects concurrently with a progress bar; failures are kept for retry"""
+    progress = st.progress(0.0, text=f"Deleting {len(projects)} project(s)...")
+
+    def on_progress(done, total, project, ok):
+        status = "deleted" if ok else "failed"
+        progress.progress(done / total, text=f"{done}/{total} • {project} {status}")
+
+    result = run_bulk(
+        projects,
+        lambda project: api_client.delete_project(project, invalidate=False),
+        max_workers=Config.BULK_CONFIG["max_workers"],
+        on_progress=on_progress,
+    )
+    # One list invalidation for the whole batch
+    api_client.invalidate_list_cache("projects")
+    local_projects = st.session_state.local_user_data.get("projects", {})
+    for project in result.succeeded:
+        local_projects.pop(project, None)
+    st.session_state.bulk_delete_failed = result.failed_items
+    st.session_state.bulk_delete_result = (len(result.succeeded), result.failed)
+    st.rerun()
 
 def show_projects_page(api_client):
     """Show projects page with chat, reel tracking, and project management
@@ -69,6 +94,21 @@ def show_projects_page(api_client):
             if current_project:
                 st.info(f"**{current_project}** is currently active and cannot be deleted")
             
+            # Failures from the last bulk run, offered for retry
+            last_result = st.session_state.pop('bulk_delete_result', None)
+            if last_result:
+                deleted, failed = last_result
+                if not failed:
+                    st.success(f"Successfully deleted {deleted} project(s)!")
+                else:
+                    st.warning(
+                        f"Deleted {deleted} project(s), failed to delete {len(failed)}: "
+                        + ", ".join(f"{name} ({reason})" for name, reason in failed)
+                    )
+            retry = [p for p in st.session_state.get('bulk_delete_failed', []) if p in deletable_projects]
+            if retry and st.button(f"Retry {len(retry)} failed", key="bulk_delete_retry"):
+                bulk_delete_projects(api_client, retry)
+            
             selected_projects = st.multiselect(
                 "Select projects to delete:",
                 deletable_projects,
@@ -80,29 +120,7 @@ def show_projects_page(api_client):
                 col_bulk1, col_bulk2 = st.columns(2)
                 with col_bulk1:
                     if st.button("Delete Selected", type="primary", key="bulk_delete"):
-                        st.info(f"Deleting {len(selected_projects)} project(s)...")
-                        success_count = 0
-                        failed_count = 0
-                        for project in selected_projects:
-                            st.write(f"Deleting project: {project}")
-                            if api_client.delete_project(project):
-                                success_count += 1
-                                st.write(f"Successfully deleted: {project}")
-                                # Remove from local cache if it exists
-                                try:
-                                    if project in st.session_state.local_user_data.get("projects", {}):
-                                        del st.session_state.local_user_data["projects"][project]
-                                except Exception:
-                                    pass
-                            else:
-                                failed_count += 1
-                                st.write(f"Failed to delete: {project}")
-                        
-                        if failed_count == 0:
-                            st.success(f"Successfully deleted {success_count} project(s)!")
-                        else:
-                            st.warning(f"Deleted {success_count} project(s), failed to delete {failed_count} project(s)")
-                        st.rerun()
+                        bulk_delete_projects(api_client, selected_projects)
                 with col_bulk2:
                     if st.button("Cancel", key="bulk_cancel"):
                         st.rerun()
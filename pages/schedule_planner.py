@@ -0,0 +1,153 @@
+import streamlit as st
+import time
+from datetime import datetime
+from config import Config
+from bulk_ops import run_bulk
+from charts import content_key, figure_cache
+from schedule_planner import (
+    apply_proposals, build_entries, find_bursts, plan_stagger, window_counts,
+)
+
+def load_reel_tasks(api_client, projects):
+    """Reel tasks for every project, fetched concurrently (served from the list cache when fresh)"""
+    reel_tasks = {}
+
+    def load(project):
+        reel_tasks[project] = api_client.get_project_reel_tasks(project)
+        return True
+
+    run_bulk(projects, load, Config.BULK_CONFIG["max_workers"])
+    return reel_tasks
+
+def load_figure(start, window_seconds, before, after):
+    """Scrapes per window now vs. with the proposed intervals, memoized on the counts"""
+    def build():
+        import plotly.graph_objects as go
+        fig = go.Figure()
+        for name, counts, color in (("Current", before, '#d62728'), ("Proposed", after, '#2ca02c')):
+            windows = sorted(counts)
+            fig.add_trace(go.Bar(
+                x=[datetime.fromtimestamp(start + w * window_seconds) for w in windows],
+                y=[counts[w] for w in windows], name=name, marker_color=color, opacity=0.6,
+            ))
+        fig.update_layout(
+            height=Config.CHART_CONFIG["height"], barmode='overlay',
+            title="Scheduled scrapes per window", yaxis_title="Scrapes",
+        )
+        return fig
+    key = ("schedule", content_key(sorted(before.items())), content_key(sorted(after.items())),
+           int(start // window_seconds), window_seconds)
+    return figure_cache.get_or_build(key, build)
+
+def show_schedule_planner(api_client):
+    """Timeline of upcoming scrapes across all profile and reel tasks, with burst smoothing"""
+    st.markdown('<h1 class="brand-title">Scrape Schedule Planner</h1>', unsafe_allow_html=True)
+
+    if st.button("Back to Dashboard"):
+        st.session_state.current_page = 'dashboard'
+        st.rerun()
+
+    st.markdown("---")
+
+    settings = Config.SCHEDULE_CONFIG
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        horizon_days = st.slider("Horizon (days)", 1, 30, settings["horizon_days"], key="schedule_horizon")
+    with col2:
+        window_minutes = st.selectbox(
+            "Window (minutes)", [15, 30, 60, 120, 240],
+            index=[15, 30, 60, 120, 240].index(settings["window_minutes"]), key="schedule_window"
+        )
+    with col3:
+        threshold = st.number_input(
+            "Burst threshold (scrapes/window)", min_value=1, value=settings["burst_threshold"], key="schedule_threshold"
+        )
+    with col4:
+        jitter_pct = st.slider(
+            "Max jitter (% of interval)", 1, 50, int(settings["max_jitter_fraction"] * 100), key="schedule_jitter"
+        )
+
+    tasks = api_client.get_tracking_tasks()
+    reel_tasks = load_reel_tasks(api_client, api_client.get_project_list() or [])
+    now = time.time()
+    entries = build_entries(tasks, reel_tasks, now)
+    if not entries:
+        st.info("No tracking tasks found. Create your first task from the dashboard!")
+        return
+
+    window_seconds = window_minutes * 60
+    # Windows are aligned to the clock so reruns (and the apply click) see the same plan
+    start = now // window_seconds * window_seconds
+    end = start + horizon_days * 86400
+    counts = window_counts(entries, start, end, window_seconds)
+    bursts = find_bursts(counts, threshold)
+    proposals = plan_stagger(
+        entries, start, window_seconds, threshold, jitter_pct / 100,
+        Config.SCRAPE_INTERVALS["min_days"], Config.SCRAPE_INTERVALS["max_days"],
+    )
+    proposed_counts = window_counts(apply_proposals(entries, proposals), start, end, window_seconds)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Tasks", f"{len(entries):,}")
+    with col2:
+        st.metric("Scrapes in Horizon", f"{sum(counts.values()):,}")
+    with col3:
+        st.metric(
+            "Peak per Window", max(counts.values(), default=0),
+            delta=max(proposed_counts.values(), default=0) - max(counts.values(), default=0),
+            delta_color="inverse",
+        )
+    with col4:
+        st.metric("Bursts", len(bursts))
+
+    overdue = sum(entry.overdue for entry in entries)
+    if overdue:
+        st.caption(f"{overdue} overdue tasks are counted at now; the backend picks them up on its next pass.")
+
+    st.plotly_chart(load_figure(start, window_seconds, counts, proposed_counts), use_container_width=True)
+
+    if bursts:
+        st.markdown('<h3 class="main-header">Bursts</h3>', unsafe_allow_html=True)
+        st.dataframe(
+            [{
+                "Window Start": datetime.fromtimestamp(start + window * window_seconds).strftime('%Y-%m-%d %H:%M'),
+                "Scrapes": n,
+            } for window, n in bursts[:50]],
+            use_container_width=True, hide_index=True,
+        )
+    else:
+        st.success(f"No window has more than {threshold} scrapes in the next {horizon_days} days.")
+
+    report = st.session_state.get('schedule_apply_report')
+    if report:
+        st.success(report)
+        if st.button("Dismiss", key="schedule_apply_dismiss"):
+            del st.session_state.schedule_apply_report
+            st.rerun()
+
+    if proposals:
+        st.markdown('<h3 class="main-header">Proposed Interval Changes</h3>', unsafe_allow_html=True)
+        st.caption(
+            "Each change moves the task's next scrape by the shift shown (the next due time is the last "
+            "scrape plus the interval), and slightly different intervals keep tasks from re-aligning later."
+        )
+        st.dataframe([p.as_dict() for p in proposals], use_container_width=True, hide_index=True)
+        if st.button(f"Apply {len(proposals)} interval changes", type="primary", key="schedule_apply"):
+            progress = st.progress(0.0, text=f"Updating {len(proposals)} intervals...")
+            result = run_bulk(
+                proposals,
+                lambda p: api_client.update_scrape_interval(p.entry.task_id, p.new_interval),
+                Config.BULK_CONFIG["max_workers"],
+                on_progress=lambda done, total, p, ok: progress.progress(
+                    done / total, text=f"{done}/{total} • {p.entry.label} {'updated' if ok else 'failed'}"
+                ),
+            )
+            api_client.invalidate_list_cache(prefix="reels:")
+            st.session_state.schedule_apply_report = (
+                f"Updated {len(result.succeeded)} of {len(proposals)} intervals."
+                + (f" Failed: {', '.join(p.entry.label for p in result.failed_items[:10])}" if result.failed else "")
+            )
+            st.rerun()
+    elif bursts:
+        st.info("No interval change within the jitter limit would reduce these bursts.")
@@ -0,0 +1,145 @@
+"""
+Portfolio analytics across all tracked profiles
+
+Each profile's posts are normalized into a slim per-task frame that is kept
+until that task's ``last_scraped`` changes. A refresh only fetches and
+normalizes the tasks that were rescraped; the combined frame and the
+per-profile metrics are then recomputed with grouped, vectorized ops.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+from records import SENTIMENTS, TaskRecords
+
+WEEK_SECONDS = 7 * 86400
+
+
+def profile_frame(task: Dict, records: TaskRecords):
+    """One row per post with the columns the portfolio metrics need"""
+    from post_metrics import build_post_frames, post_sentiment_table
+
+    posts_df, comments_df = build_post_frames(records.posts)
+    sentiment = post_sentiment_table(comments_df, len(posts_df))
+    frame = posts_df[['likes', 'comments', 'views', 'timestamp']].copy()
+    for s in SENTIMENTS:
+        frame[s] = sentiment[s].to_numpy(dtype='int64')
+    frame['task_id'] = task['_id']
+    frame['target_profile'] = task.get('target_profile', 'unknown')
+    frame['is_competitor'] = bool(task.get('is_competitor'))
+    frame['followers'] = float(records.followers) if records.followers else float('nan')
+    return frame.astype({'task_id': 'string', 'target_profile': 'string'})
+
+
+def portfolio_metrics(frame):
+    """Engagement, posting cadence and sentiment mix per profile from the combined frame"""
+    import numpy as np
+    import pandas as pd
+
+    if frame.empty:
+        return pd.DataFrame()
+    grouped = frame.groupby('task_id', sort=False)
+    metrics = grouped.agg(
+        target_profile=('target_profile', 'first'),
+        is_competitor=('is_competitor', 'first'),
+        followers=('followers', 'first'),
+        posts=('likes', 'size'),
+        total_likes=('likes', 'sum'),
+        total_comments=('comments', 'sum'),
+        total_views=('views', 'sum'),
+        first_post=('timestamp', 'min'),
+        last_post=('timestamp', 'max'),
+        dated_posts=('timestamp', 'count'),
+        **{s: (s, 'sum') for s in SENTIMENTS},
+    )
+    engagement = metrics['total_likes'] + metrics['total_comments']
+    metrics['engagement_per_post'] = engagement / metrics['posts']
+    metrics['engagement_rate'] = metrics['engagement_per_post'] / metrics['followers'] * 100
+
+    # Posts per week over the span covered by the scraped posts
+    span = metrics['last_post'] - metrics['first_post']
+    metrics['posts_per_week'] = ((metrics['dated_posts'] - 1) / span * WEEK_SECONDS).where(span > 0)
+    ordered = frame.dropna(subset=['timestamp']).sort_values(['task_id', 'timestamp'])
+    gaps = ordered.groupby('task_id', sort=False)['timestamp'].diff() / 86400
+    metrics['median_gap_days'] = gaps.groupby(ordered['task_id']).median()
+
+    counted = metrics[list(SENTIMENTS)].sum(axis=1)
+    for s in SENTIMENTS:
+        metrics[f'pct_{s}'] = (metrics[s] / counted.where(counted > 0) * 100).fillna(0.0)
+    metrics['net_sentiment'] = metrics['pct_positive'] - metrics['pct_negative']
+    metrics['last_post'] = pd.to_datetime(metrics['last_post'], unit='s')
+    return metrics.drop(columns=['first_post', 'dated_posts']).replace([np.inf, -np.inf], np.nan)
+
+
+class PortfolioEngine:
+    """Per-session portfolio state, refreshed incrementally by task version"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        # task_id -> (last_scraped, per-task frame)
+        self._frames: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._combined_key = None
+        self._metrics = None
+        self.failed: List[str] = []
+
+    @property
+    def metrics(self):
+        """Metrics from the last refresh (None before the first one)"""
+        return self._metrics
+
+    def stale_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        with self._lock:
+            return [
+                task for task in tasks
+                if task.get('_id') and self._frames.get(task['_id'], (object(),))[0] != task.get('last_scraped')
+            ]
+
+    def refresh(self, api_client, tasks: List[Dict],
+                on_progress: Optional[Callable[[int, int], None]] = None):
+        """Bring the portfolio up to date with ``tasks`` and return the metrics frame.
+
+        Only tasks whose ``last_scraped`` changed since the last refresh are
+        fetched, concurrently on a bounded pool through the task details cache.
+        """
+        stale = self.stale_tasks(tasks)
+        self.failed = []
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="portfolio") as pool:
+                futures = {pool.submit(self._load, api_client, task): task for task in stale}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    task = futures[future]
+                    try:
+                        frame = future.result()
+                    except Exception as e:
+                        print(f"Portfolio fetch failed for {task['_id']}: {e}")
+                        frame = None
+                    if frame is None:
+                        self.failed.append(task.get('target_profile', task['_id']))
+                    else:
+                        with self._lock:
+                            self._frames[task['_id']] = (task.get('last_scraped'), frame)
+                    if on_progress:
+                        on_progress(done, len(stale))
+
+        live = {task['_id'] for task in tasks if task.get('_id')}
+        with self._lock:
+            for task_id in [tid for tid in self._frames if tid not in live]:
+                del self._frames[task_id]
+            key = frozenset((tid, version) for tid, (version, _) in self._frames.items())
+            if key != self._combined_key:
+                import pandas as pd
+                frames = [frame for _, frame in self._frames.values()]
+                combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                self._metrics = portfolio_metrics(combined)
+                self._combined_key = key
+            return self._metrics
+
+    @staticmethod
+    def _load(api_client, task: Dict):
+        records = api_client.get_task_records(task)
+        if records is None:
+            return None
+        return profile_frame(task, records)
+
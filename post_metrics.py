@@ -0,0 +1,121 @@
+"""
+Columnar post and comment frames with vectorized engagement and sentiment metrics
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from records import SENTIMENTS, Post
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def build_post_frames(posts: Sequence[Post]) -> Tuple["pd.DataFrame", "pd.DataFrame"]:
+    """Build (posts_df, comments_df) typed frames from normalized Post records.
+
+    posts_df: one row per post, ``likes``/``comments``/``views`` as int64,
+    ``timestamp`` as float64 (NaN when unknown), ``caption`` and ``type``.
+    comments_df: one row per top comment with ``post_idx`` and a categorical
+    ``sentiment`` limited to positive/neutral/negative.
+    """
+    import pandas as pd
+    import numpy as np
+
+    n = len(posts)
+    posts_df = pd.DataFrame({
+        'likes': np.fromiter((p.likes for p in posts), dtype='int64', count=n),
+        'comments': np.fromiter((p.comments for p in posts), dtype='int64', count=n),
+        'views': np.fromiter((p.views for p in posts), dtype='int64', count=n),
+        'timestamp': np.fromiter(
+            (p.timestamp if p.timestamp is not None else np.nan for p in posts), dtype='float64', count=n
+        ),
+        'caption': [p.caption for p in posts],
+        'type': [p.type for p in posts],
+    })
+
+    # Flatten nested comments once; everything downstream is columnar
+    flat = [(idx, c.sentiment, c.likes, c.timestamp) for idx, p in enumerate(posts) for c in p.top_comments]
+    comments_df = pd.DataFrame(flat, columns=['post_idx', 'sentiment', 'likes', 'timestamp'])
+    comments_df['post_idx'] = comments_df['post_idx'].astype('int64')
+    comments_df['sentiment'] = pd.Categorical(comments_df['sentiment'], categories=list(SENTIMENTS))
+    comments_df['likes'] = comments_df['likes'].astype('int64')
+    comments_df['timestamp'] = pd.to_numeric(comments_df['timestamp'], errors='coerce').astype('float64')
+    return posts_df, comments_df
+
+
+def summarize_posts(posts_df) -> Dict:
+    """Totals and per-post averages for the metric tiles"""
+    count = len(posts_df)
+    total_likes = int(posts_df['likes'].sum())
+    total_comments = int(posts_df['comments'].sum())
+    return {
+        'count': count,
+        'total_likes': total_likes,
+        'total_comments': total_comments,
+        'avg_likes': total_likes / count if count else 0,
+        'avg_comments': total_comments / count if count else 0,
+    }
+
+
+def post_sentiment_table(comments_df, n_posts: int):
+    """Per-post sentiment counts and percentages, indexed by post position.
+
+    Columns: positive/neutral/negative counts, ``total`` and ``pct_<sentiment>``.
+    """
+    counts = (
+        comments_df.groupby(['post_idx', 'sentiment'], observed=False).size()
+        .unstack('sentiment', fill_value=0)
+        .reindex(index=range(n_posts), columns=list(SENTIMENTS), fill_value=0)
+    )
+    counts.columns = list(SENTIMENTS)
+    counts['total'] = counts[list(SENTIMENTS)].sum(axis=1)
+    shares = counts[list(SENTIMENTS)].div(counts['total'].where(counts['total'] > 0, 1), axis=0) * 100
+    for sentiment in SENTIMENTS:
+        counts[f'pct_{sentiment}'] = shares[sentiment]
+    return counts
+
+
+def summarize_sentiment(comments_df) -> Dict:
+    """Profile-level sentiment summary in the shape of the sentiment_summary endpoint"""
+    counts = comments_df['sentiment'].value_counts().reindex(list(SENTIMENTS), fill_value=0)
+    total = int(counts.sum())
+    distribution = {s: int(counts[s]) for s in SENTIMENTS}
+    return {
+        'total_comments': total,
+        'sentiment_distribution': distribution,
+        'sentiment_percentages': {
+            s: round(distribution[s] / total * 100, 1) if total else 0.0 for s in SENTIMENTS
+        },
+        'overall_sentiment': max(SENTIMENTS, key=distribution.get) if total else 'neutral',
+    }
+
+
+def compare_sentiment_summaries(local: Dict, server: Dict) -> List[str]:
+    """Human-readable differences between a local and a server sentiment summary"""
+    diffs = []
+    if local.get('total_comments') != server.get('total_comments'):
+        diffs.append(f"total_comments {local.get('total_comments')} vs {server.get('total_comments')}")
+    server_dist = server.get('sentiment_distribution') or {}
+    for s in SENTIMENTS:
+        if local['sentiment_distribution'].get(s, 0) != server_dist.get(s, 0):
+            diffs.append(f"{s} {local['sentiment_distribution'].get(s, 0)} vs {server_dist.get(s, 0)}")
+    if local.get('overall_sentiment') != server.get('overall_sentiment'):
+        diffs.append(f"overall {local.get('overall_sentiment')} vs {server.get('overall_sentiment')}")
+    return diffs
+
+
+def format_post_table(posts_df, limit: int = 10):
+    """Display table for the most recent posts (caption truncated, local dates)"""
+    import pandas as pd
+    from datetime import datetime
+    head = posts_df.head(limit)
+    caption = head['caption']
+    caption = caption.where(caption.str.len() <= 100, caption.str.slice(0, 100) + '...')
+    local_tz = datetime.now().astimezone().tzinfo
+    dates = pd.to_datetime(head['timestamp'], unit='s', utc=True).dt.tz_convert(local_tz).dt.strftime('%Y-%m-%d')
+    return pd.DataFrame({
+        'Caption': caption,
+        'Likes': head['likes'],
+        'Comments': head['comments'],
+        'Date': dates.fillna('Unknown'),
+    })
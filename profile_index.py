@@ -0,0 +1,38 @@
+"""
+Prefix-search index over tracked profile usernames
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+
+
+class PrefixIndex:
+    """Sorted (username, position) keys; a prefix lookup is two bisections.
+
+    Built once per task list and reused across reruns while the list is
+    unchanged, so typing in the search box never rescans every task.
+    """
+
+    def __init__(self, tasks: Sequence[Dict], field: str = "target_profile"):
+        self.tasks = list(tasks)
+        self.signature = self.signature_of(tasks)
+        entries = sorted(
+            (str(task.get(field) or "").lower(), pos) for pos, task in enumerate(self.tasks)
+        )
+        self._keys = [key for key, _ in entries]
+        self._positions = [pos for _, pos in entries]
+
+    @staticmethod
+    def signature_of(tasks: Sequence[Dict]):
+        return tuple((task.get("_id"), task.get("target_profile"), task.get("last_scraped"), task.get("status"))
+                     for task in tasks)
+
+    def search(self, prefix: str) -> List[Dict]:
+        """Tasks whose username starts with ``prefix`` (case-insensitive, leading @ ignored)"""
+        prefix = prefix.strip().lstrip("@").lower()
+        if not prefix:
+            return list(self.tasks)
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        # Keep the original task order; the caller sorts
+        return [self.tasks[pos] for pos in sorted(self._positions[lo:hi])]
@@ -0,0 +1,201 @@
+"""
+Compact normalized records for tracking payloads
+
+The backend returns posts, reels and task status in several shapes
+(`posts` / `scraped_posts` / `target_profile_data.scraped_posts`, `likes` vs
+`likes_count`, ...). These helpers resolve the variants once so pages can use
+plain attribute access.
+"""
+
+import sys
+from typing import Dict, List, Optional, Tuple
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_ts(value) -> Optional[float]:
+    """Unix timestamp as float, or None when missing/zero/invalid"""
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    return ts if ts > 0 else None
+
+
+def _first_present(data: Dict, *keys):
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def normalize_sentiment(value) -> str:
+    sentiment = (value or "neutral")
+    sentiment = sentiment.lower() if isinstance(sentiment, str) else "neutral"
+    return sentiment if sentiment in SENTIMENTS else "neutral"
+
+
+class Comment:
+    __slots__ = ("text", "owner_username", "sentiment", "likes", "timestamp")
+
+    def __init__(self, text: str, owner_username: str, sentiment: str, likes: int, timestamp: Optional[float]):
+        self.text = text
+        self.owner_username = owner_username
+        self.sentiment = sentiment
+        self.likes = likes
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Comment":
+        return cls(
+            text=data.get("text") or "",
+            owner_username=data.get("owner_username") or "unknown",
+            sentiment=normalize_sentiment(data.get("sentiment")),
+            likes=_to_int(data.get("likes_count")),
+            timestamp=_to_ts(data.get("timestamp")),
+        )
+
+
+class Post:
+    __slots__ = ("post_id", "url", "timestamp", "type", "caption", "likes", "comments", "views", "top_comments")
+
+    def __init__(self, post_id, url, timestamp, type, caption, likes, comments, views, top_comments):
+        self.post_id = post_id
+        self.url = url
+        self.timestamp = timestamp
+        self.type = type
+        self.caption = caption
+        self.likes = likes
+        self.comments = comments
+        self.views = views
+        self.top_comments = top_comments
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Post":
+        comments = _first_present(data, "comments_count", "comments")
+        return cls(
+            post_id=data.get("post_id") or data.get("id"),
+            url=data.get("post_url") or data.get("url"),
+            timestamp=_to_ts(data.get("timestamp")),
+            type=data.get("type") or "Unknown",
+            caption=data.get("caption") or "",
+            likes=_to_int(_first_present(data, "likes", "likes_count")),
+            comments=_to_int(comments) if not isinstance(comments, list) else len(comments),
+            views=_to_int(_first_present(data, "video_view_count", "views")),
+            top_comments=tuple(
+                Comment.from_dict(c) for c in (data.get("top_comments") or []) if isinstance(c, dict)
+            ),
+        )
+
+
+class TaskRecords:
+    """Normalized view of a profile task's details payload"""
+    __slots__ = ("task_id", "posts", "followers")
+
+    def __init__(self, task_id: Optional[str], posts: Tuple[Post, ...], followers: Optional[int] = None):
+        self.task_id = task_id
+        self.posts = posts
+        self.followers = followers
+
+
+class ReelSnapshot:
+    __slots__ = (
+        "task_id", "reel_id", "reel_url", "last_scraped", "scrape_interval_days",
+        "likes", "comments", "views", "overall_sentiment", "has_data",
+    )
+
+    def __init__(self, task_id, reel_id, reel_url, last_scraped, scrape_interval_days,
+                 likes, comments, views, overall_sentiment, has_data):
+        self.task_id = task_id
+        self.reel_id = reel_id
+        self.reel_url = reel_url
+        self.last_scraped = last_scraped
+        self.scrape_interval_days = scrape_interval_days
+        self.likes = likes
+        self.comments = comments
+        self.views = views
+        self.overall_sentiment = overall_sentiment
+        self.has_data = has_data
+
+    @classmethod
+    def from_task(cls, task: Dict) -> "ReelSnapshot":
+        reel_data = task.get("reel_data") or {}
+        sentiment = (reel_data.get("sentiment_analysis") or {}).get("overall_sentiment")
+        return cls(
+            task_id=task.get("_id"),
+            reel_id=task.get("reel_id") or "Unknown",
+            reel_url=task.get("reel_url") or "",
+            last_scraped=_to_ts(task.get("last_scraped")),
+            scrape_interval_days=task.get("scrape_interval_days", 2),
+            likes=_to_int(_first_present(reel_data, "likes", "likes_count")),
+            comments=_to_int(_first_present(reel_data, "comments", "comments_count")),
+            views=_to_int(_first_present(reel_data, "views", "video_view_count")),
+            overall_sentiment=normalize_sentiment(sentiment),
+            has_data=bool(reel_data),
+        )
+
+
+class TaskStatus:
+    __slots__ = ("task_id", "is_processing", "status", "latest_event_type", "latest_event_ts")
+
+    def __init__(self, task_id, is_processing, status, latest_event_type, latest_event_ts):
+        self.task_id = task_id
+        self.is_processing = is_processing
+        self.status = status
+        self.latest_event_type = latest_event_type
+        self.latest_event_ts = latest_event_ts
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "TaskStatus":
+        event = payload.get("latest_event") or {}
+        return cls(
+            task_id=payload.get("task_id"),
+            is_processing=bool(payload.get("is_processing")),
+            status=payload.get("status") or ("processing" if payload.get("is_processing") else "idle"),
+            latest_event_type=event.get("event_type") if event else None,
+            latest_event_ts=_to_ts(event.get("timestamp")) if event else None,
+        )
+
+
+def extract_posts(task_details: Optional[Dict]) -> List[Dict]:
+    """Return the raw posts list from any of the payload shapes the backend uses"""
+    if not task_details:
+        return []
+    return (
+        task_details.get("posts")
+        or task_details.get("scraped_posts")
+        or (task_details.get("target_profile_data") or {}).get("scraped_posts")
+        or []
+    )
+
+
+def normalize_task_details(task_details: Optional[Dict], task_id: Optional[str] = None) -> TaskRecords:
+    """Convert a raw task details payload into compact records"""
+    posts = tuple(Post.from_dict(p) for p in extract_posts(task_details) if isinstance(p, dict))
+    profile_data = (task_details or {}).get("target_profile_data") or {}
+    followers = _to_int(profile_data.get("followers")) or None
+    return TaskRecords(task_id or (task_details or {}).get("_id"), posts, followers)
+
+
+def deep_sizeof(obj, _seen=None) -> int:
+    """Recursive `sys.getsizeof` over dicts, sequences and __slots__ objects"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, name), seen) for name in obj.__slots__ if hasattr(obj, name))
+    return size
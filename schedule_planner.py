@@ -0,0 +1,156 @@
+"""
+Scrape schedule timeline, burst detection and staggered interval proposals
+"""
+
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DAY = 86400.0
+
+
+def _ts(value) -> Optional[float]:
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return None
+    return ts if ts > 0 else None
+
+
+class ScheduleEntry:
+    """One task's scrape cadence: interval and the next time it is due"""
+    __slots__ = ("task_id", "label", "kind", "interval_days", "next_due", "overdue")
+
+    def __init__(self, task_id: str, label: str, kind: str, interval_days: float, next_due: float, overdue: bool):
+        self.task_id = task_id
+        self.label = label
+        self.kind = kind
+        self.interval_days = interval_days
+        self.next_due = next_due
+        self.overdue = overdue
+
+    @classmethod
+    def from_task(cls, task: Dict, label: str, kind: str, now: float) -> "ScheduleEntry":
+        try:
+            interval = float(task.get("scrape_interval_days") or 2)
+        except (TypeError, ValueError):
+            interval = 2.0
+        due = _ts(task.get("next_scrape_due"))
+        if due is None:
+            last = _ts(task.get("last_scraped"))
+            due = last + interval * DAY if last else now
+        # Overdue tasks go out on the backend's next pass
+        return cls(task.get("_id"), label, kind, interval, max(due, now), due < now)
+
+    def shifted(self, interval_days: float, shift_seconds: float) -> "ScheduleEntry":
+        return ScheduleEntry(self.task_id, self.label, self.kind, interval_days,
+                             self.next_due + shift_seconds, self.overdue)
+
+
+def build_entries(profile_tasks: Iterable[Dict], reel_tasks: Dict[str, List[Dict]], now: float) -> List[ScheduleEntry]:
+    """Entries for profile tasks and for reel tasks keyed by project"""
+    entries = [
+        ScheduleEntry.from_task(task, f"@{task.get('target_profile')}", "profile", now)
+        for task in profile_tasks if task.get("_id")
+    ]
+    for project, tasks in reel_tasks.items():
+        entries.extend(
+            ScheduleEntry.from_task(task, f"{project} / {task.get('reel_id') or task.get('_id')}", "reel", now)
+            for task in tasks if task.get("_id")
+        )
+    return entries
+
+
+def timeline(entries: List[ScheduleEntry], end: float) -> Iterator[Tuple[float, ScheduleEntry]]:
+    """Every scheduled scrape up to ``end`` in time order.
+
+    A heap holds one pending occurrence per task; popping one pushes the
+    task's next, so the cost is O(events * log tasks) without materializing
+    and sorting every task's occurrences first.
+    """
+    heap = [(entry.next_due, pos) for pos, entry in enumerate(entries) if entry.interval_days > 0]
+    heapq.heapify(heap)
+    while heap and heap[0][0] <= end:
+        due, pos = heapq.heappop(heap)
+        entry = entries[pos]
+        yield due, entry
+        heapq.heappush(heap, (due + entry.interval_days * DAY, pos))
+
+
+def window_counts(entries: List[ScheduleEntry], start: float, end: float, window_seconds: float) -> Counter:
+    """Scrapes per window index (window 0 starts at ``start``)"""
+    return Counter(int((due - start) // window_seconds) for due, _ in timeline(entries, end))
+
+
+def find_bursts(counts: Counter, threshold: int) -> List[Tuple[int, int]]:
+    """(window, scrapes) for windows above the threshold, busiest first"""
+    return sorted(((window, n) for window, n in counts.items() if n > threshold), key=lambda item: (-item[1], item[0]))
+
+
+class StaggerProposal:
+    """A new interval for one task and how far it moves its next scrape"""
+    __slots__ = ("entry", "new_interval", "shift_seconds")
+
+    def __init__(self, entry: ScheduleEntry, new_interval: float, shift_seconds: float):
+        self.entry = entry
+        self.new_interval = new_interval
+        self.shift_seconds = shift_seconds
+
+    def as_dict(self):
+        return {
+            "Task": self.entry.label,
+            "Type": self.entry.kind.title(),
+            "Interval (days)": self.entry.interval_days,
+            "New Interval (days)": self.new_interval,
+            "Shift (h)": round(self.shift_seconds / 3600, 1),
+        }
+
+
+def plan_stagger(entries: List[ScheduleEntry], start: float, window_seconds: float, threshold: int,
+                 max_jitter_fraction: float, min_days: float, max_days: float) -> List[StaggerProposal]:
+    """Spread upcoming scrapes out of windows holding more than ``threshold``.
+
+    Works on each task's next due time. Tasks beyond the threshold in a busy
+    window move to the least-loaded window within ``max_jitter_fraction`` of
+    their interval, by lengthening or shortening the interval by the same
+    amount. The backend computes the next due time from the last scrape plus
+    the interval, so the new interval moves the next scrape. Tasks on
+    different intervals also stop lining up on later cycles. Overdue tasks
+    are left alone, because a small interval change would not move them past
+    now.
+    """
+    load: Counter = Counter()
+    members: Dict[int, List[ScheduleEntry]] = {}
+    for entry in entries:
+        window = int((entry.next_due - start) // window_seconds)
+        load[window] += 1
+        if not entry.overdue:
+            members.setdefault(window, []).append(entry)
+
+    proposals: List[StaggerProposal] = []
+    for window in sorted(w for w, n in load.items() if n > threshold):
+        movable = sorted(members.get(window, ()), key=lambda e: e.task_id)
+        for entry in movable[max(0, threshold - (load[window] - len(movable))):]:
+            if load[window] <= threshold:
+                break
+            reach = int(entry.interval_days * DAY * max_jitter_fraction // window_seconds)
+            lo = max(-reach, int((min_days - entry.interval_days) * DAY // window_seconds) + 1, -window)
+            hi = min(reach, int((max_days - entry.interval_days) * DAY // window_seconds))
+            best = min(range(lo, hi + 1), key=lambda d: (load[window + d], abs(d)), default=0)
+            if best == 0 or load[window + best] + 1 >= load[window]:
+                continue
+            new_interval = round(entry.interval_days + best * window_seconds / DAY, 3)
+            load[window] -= 1
+            load[window + best] += 1
+            proposals.append(StaggerProposal(entry, new_interval, (new_interval - entry.interval_days) * DAY))
+    return proposals
+
+
+def apply_proposals(entries: List[ScheduleEntry], proposals: List[StaggerProposal]) -> List[ScheduleEntry]:
+    """Entries as they would be with the proposals applied (for the preview)"""
+    moved = {p.entry.task_id: p for p in proposals}
+    return [
+        entry.shifted(moved[entry.task_id].new_interval, moved[entry.task_id].shift_seconds)
+        if entry.task_id in moved else entry
+        for entry in entries
+    ]
@@ -0,0 +1,123 @@
+"""
+Incremental scrape diffing for profile tasks
+
+A scrape is reduced to a compact per-post index (a digest of each post plus
+hashed comment keys). When ``last_scraped`` advances, the new records are
+compared against the previous index: posts whose digest is unchanged are
+skipped outright, and only the rest are diffed field by field.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from records import Comment, Post, TaskRecords
+
+
+def post_key(post: Post, idx: int):
+    """Stable identity of a post across scrapes"""
+    return post.post_id or post.url or f"#{idx}"
+
+
+def comment_key(comment: Comment) -> int:
+    return hash((comment.owner_username, comment.text))
+
+
+class PostSignature:
+    """What the diff needs to remember about a post from the previous scrape"""
+    __slots__ = ("digest", "likes", "comments", "views", "comment_sentiments")
+
+    def __init__(self, digest: int, likes: int, comments: int, views: int, comment_sentiments: Dict[int, str]):
+        self.digest = digest
+        self.likes = likes
+        self.comments = comments
+        self.views = views
+        self.comment_sentiments = comment_sentiments
+
+    @classmethod
+    def from_post(cls, post: Post) -> "PostSignature":
+        comment_sentiments = {comment_key(c): c.sentiment for c in post.top_comments}
+        digest = hash((
+            post.likes, post.comments, post.views, post.caption,
+            tuple(comment_sentiments.items()),
+        ))
+        return cls(digest, post.likes, post.comments, post.views, comment_sentiments)
+
+
+def build_scrape_index(records: TaskRecords) -> Dict[object, PostSignature]:
+    return {post_key(p, i): PostSignature.from_post(p) for i, p in enumerate(records.posts)}
+
+
+class PostDelta:
+    __slots__ = ("post_key", "likes", "comments", "views", "new_comments", "sentiment_shifts")
+
+    def __init__(self, post_key, likes: int, comments: int, views: int,
+                 new_comments: Tuple[Comment, ...], sentiment_shifts: Tuple[Tuple[Comment, str], ...]):
+        self.post_key = post_key
+        self.likes = likes
+        self.comments = comments
+        self.views = views
+        self.new_comments = new_comments
+        # (comment, previous sentiment) for comments whose label changed
+        self.sentiment_shifts = sentiment_shifts
+
+
+class ChangeSet:
+    """Changes between two scrapes of the same task"""
+    __slots__ = ("previous_version", "version", "new_posts", "removed_posts", "deltas")
+
+    def __init__(self, previous_version, version, new_posts: Tuple, removed_posts: Tuple, deltas: Dict):
+        self.previous_version = previous_version
+        self.version = version
+        self.new_posts = new_posts
+        self.removed_posts = removed_posts
+        self.deltas = deltas
+
+    @property
+    def changed_posts(self):
+        return set(self.new_posts) | set(self.deltas)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.new_posts or self.removed_posts or self.deltas)
+
+    def totals(self) -> Dict[str, int]:
+        deltas = self.deltas.values()
+        return {
+            "new_posts": len(self.new_posts),
+            "likes": sum(d.likes for d in deltas),
+            "comments": sum(d.comments for d in deltas),
+            "views": sum(d.views for d in deltas),
+            "new_comments": sum(len(d.new_comments) for d in deltas),
+            "sentiment_shifts": sum(len(d.sentiment_shifts) for d in deltas),
+        }
+
+
+def diff_scrapes(previous: Dict[object, PostSignature], records: TaskRecords,
+                 current: Optional[Dict[object, PostSignature]] = None,
+                 previous_version=None, version=None) -> ChangeSet:
+    """Diff new records against the previous scrape's index"""
+    current = current if current is not None else build_scrape_index(records)
+    new_posts = []
+    deltas = {}
+    for idx, post in enumerate(records.posts):
+        key = post_key(post, idx)
+        old = previous.get(key)
+        if old is None:
+            new_posts.append(key)
+            continue
+        sig = current[key]
+        if sig.digest == old.digest:
+            continue
+        new_comments = []
+        shifts = []
+        for c in post.top_comments:
+            old_sentiment = old.comment_sentiments.get(comment_key(c))
+            if old_sentiment is None:
+                new_comments.append(c)
+            elif old_sentiment != c.sentiment:
+                shifts.append((c, old_sentiment))
+        deltas[key] = PostDelta(
+            key, post.likes - old.likes, post.comments - old.comments, post.views - old.views,
+            tuple(new_comments), tuple(shifts),
+        )
+    removed = tuple(key for key in previous if key not in current)
+    return ChangeSet(previous_version, version, tuple(new_posts), removed, deltas)
@@ -0,0 +1,215 @@
+"""
+Bulk force scrapes with a cap on scrapes in flight, tracked through a shared status poller
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bulk_ops import run_bulk
+from config import Config
+from records import TaskStatus
+
+FINISHED_STATES = {"done", "skipped", "failed", "timed out", "cancelled"}
+
+
+class StatusPoller:
+    """Per-session task status lookups shared by every page and bulk run.
+
+    A status fetched less than ``max_age`` seconds ago is reused, so the
+    per-reel status captions, the status monitors and a running bulk scrape
+    don't each hit the status endpoint for the same task.
+    """
+
+    def __init__(self, max_age: float, max_workers: int):
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self._statuses: Dict[str, Tuple[float, TaskStatus]] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, task_id: str, max_age: Optional[float] = None) -> Optional[TaskStatus]:
+        with self._lock:
+            entry = self._statuses.get(task_id)
+        if entry is None or (max_age is not None and time.time() - entry[0] > max_age):
+            return None
+        return entry[1]
+
+    def record(self, task_id: str, status: TaskStatus):
+        with self._lock:
+            self._statuses[task_id] = (time.time(), status)
+
+    def forget(self, task_id: str):
+        with self._lock:
+            self._statuses.pop(task_id, None)
+
+    def get(self, api_client, task_id: str) -> Optional[TaskStatus]:
+        status = self.cached(task_id, self.max_age)
+        if status is None:
+            status = api_client.fetch_task_status_record(task_id)
+            if status is not None:
+                self.record(task_id, status)
+        return status
+
+    def refresh(self, api_client, task_ids: Iterable[str]) -> Dict[str, TaskStatus]:
+        """Statuses for many tasks; stale ones are fetched on a bounded pool"""
+        statuses: Dict[str, TaskStatus] = {}
+        stale: List[str] = []
+        for task_id in task_ids:
+            status = self.cached(task_id, self.max_age)
+            if status is None:
+                stale.append(task_id)
+            else:
+                statuses[task_id] = status
+
+        def fetch(task_id: str) -> bool:
+            status = api_client.fetch_task_status_record(task_id)
+            if status is None:
+                return False
+            self.record(task_id, status)
+            statuses[task_id] = status
+            return True
+
+        run_bulk(stale, fetch, self.max_workers)
+        return statuses
+
+
+class ScrapeJob:
+    """One task in a bulk scrape and where it stands"""
+    __slots__ = ("task_id", "label", "state", "message", "submitted_at", "finished_at")
+
+    def __init__(self, task_id: str, label: str):
+        self.task_id = task_id
+        self.label = label
+        self.state = "queued"
+        self.message = ""
+        self.submitted_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def finish(self, state: str, message: Optional[str] = None):
+        self.state = state
+        if message is not None:
+            self.message = message
+        self.finished_at = time.time()
+
+    def as_dict(self):
+        elapsed = ""
+        if self.submitted_at:
+            elapsed = f"{int((self.finished_at or time.time()) - self.submitted_at)}s"
+        return {"Task": self.label, "State": self.state, "Elapsed": elapsed, "Details": self.message}
+
+
+class ScrapeRun:
+    """Drives a bulk force scrape on a background thread.
+
+    At most ``max_concurrent`` jobs are scraping at any time: free slots are
+    filled from the queue, then the scraping jobs are polled through the
+    shared ``StatusPoller`` until they go idle, which frees the slot for the
+    next one. A 409 on submit means the backend is already scraping that
+    task, so the job is tracked like one we started.
+    """
+
+    def __init__(self, api_client, jobs: List[ScrapeJob], poller: StatusPoller, reel: bool = False,
+                 max_concurrent: Optional[int] = None):
+        settings = Config.SCRAPE_CONFIG
+        self.api_client = api_client
+        self.jobs = jobs
+        self.poller = poller
+        self.reel = reel
+        self.max_concurrent = max(1, max_concurrent or settings["max_concurrent_scrapes"])
+        self.poll_interval = settings["poll_interval_seconds"]
+        self.grace = settings["completion_grace_seconds"]
+        self.max_wait = settings["max_wait_seconds"]
+        self.started_at = time.time()
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="bulk-scrape", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop submitting new scrapes; ones already running on the backend are left to finish"""
+        self._cancelled.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    @property
+    def finished(self) -> int:
+        return sum(1 for job in self.jobs if job.state in FINISHED_STATES)
+
+    def summary(self) -> str:
+        parts = [f"{self.finished}/{len(self.jobs)} finished"]
+        parts += [f"{count} {state}" for state, count in sorted(self.counts().items()) if state != "done"]
+        return " • ".join(parts)
+
+    def _submit(self, job: ScrapeJob) -> bool:
+        job.submitted_at = time.time()
+        outcome = self.api_client.submit_force_scrape(job.task_id, reel=self.reel)
+        # Whatever was cached predates this scrape
+        self.poller.forget(job.task_id)
+        if outcome == "failed":
+            job.finish("failed", "force scrape request failed")
+            return False
+        job.state = "scraping"
+        job.message = "already in progress" if outcome == "in_progress" else ""
+        return True
+
+    def _check(self, job: ScrapeJob, status: Optional[TaskStatus], now: float):
+        elapsed = now - job.submitted_at
+        if status is not None and not status.is_processing:
+            # The backend may not have flipped to processing yet right after submit
+            if elapsed >= self.grace or (status.latest_event_ts or 0) >= job.submitted_at:
+                job.finish("done")
+                self.api_client.invalidate_task_cache(job.task_id)
+                return
+        if elapsed > self.max_wait:
+            job.finish("timed out", f"still processing after {int(elapsed)}s")
+
+    def _run(self):
+        queue = [job for job in self.jobs if job.state == "queued"]
+        while True:
+            scraping = [job for job in self.jobs if job.state == "scraping"]
+            if self._cancelled.is_set():
+                for job in queue:
+                    job.finish("cancelled")
+                queue = []
+            free = self.max_concurrent - len(scraping)
+            if free > 0 and queue:
+                batch, queue = queue[:free], queue[free:]
+                run_bulk(batch, self._submit, len(batch))
+                scraping = [job for job in self.jobs if job.state == "scraping"]
+            if not scraping and not queue:
+                return
+            self._cancelled.wait(self.poll_interval)
+            statuses = self.poller.refresh(self.api_client, [job.task_id for job in scraping])
+            now = time.time()
+            for job in scraping:
+                self._check(job, statuses.get(job.task_id), now)
+
+
+def start_scrape_run(api_client, targets: Iterable[Tuple[str, str]], reel: bool = False) -> ScrapeRun:
+    """Start a bulk scrape of (task_id, label) targets.
+
+    Tasks whose recently cached status shows a scrape already running are
+    skipped rather than submitted again.
+    """
+    poller = api_client.status_poller or StatusPoller(
+        Config.SCRAPE_CONFIG["status_max_age_seconds"], Config.SCRAPE_CONFIG["status_workers"]
+    )
+    jobs = []
+    for task_id, label in targets:
+        job = ScrapeJob(task_id, label)
+        status = poller.cached(task_id, Config.SCRAPE_CONFIG["poll_interval_seconds"] * 2)
+        if status is not None and status.is_processing:
+            job.finish("skipped", "already processing")
+        jobs.append(job)
+    return ScrapeRun(api_client, jobs, poller, reel=reel).start()
@@ -0,0 +1,220 @@
+"""
+Version-stamped cache for tracking task details with speculative background prefetch
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from records import deep_sizeof
+from scrape_diff import build_scrape_index, diff_scrapes
+
+# Shared worker pool for all sessions in this Streamlit process. Lives in an
+# imported module so it survives script reruns.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task-prefetch")
+        return _executor
+
+
+def _payload_size(value) -> int:
+    """Approximate in-memory weight of a payload (JSON length, frame memory usage, or deep
+    size of ``__slots__`` records, whose JSON form would only be their repr)"""
+    if isinstance(value, tuple):
+        return sum(_payload_size(item) for item in value)
+    if hasattr(value, "__slots__"):
+        return deep_sizeof(value)
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except Exception:
+            return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 0
+
+
+class TaskDetailsCache:
+    """Per-session LRU cache of task details and values derived from them.
+
+    Every entry is stamped with the task's ``last_scraped`` value. A lookup with a
+    different stamp is a miss, so a rescrape invalidates the entry implicitly.
+    """
+
+    def __init__(self, max_bytes: int, max_workers: int, max_baselines: int = 256):
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_baselines = max_baselines
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # Per-task index of the last scrape seen, kept outside the LRU entries so
+        # a rescrape (which drops the entry) can still be diffed against it
+        self._baselines: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, task_id: str, version, field: str, wait_seconds: float = 0.0):
+        """Return a cached field for a task if the stamp matches, else None.
+
+        If a prefetch for the task is in flight, wait up to ``wait_seconds`` for it.
+        """
+        future = None
+        with self._lock:
+            future = self._pending.get(task_id)
+        if future is not None and wait_seconds > 0:
+            try:
+                future.result(timeout=wait_seconds)
+            except Exception:
+                pass
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry["version"] != version or field not in entry["fields"]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(task_id)
+            self.hits += 1
+            return entry["fields"][field]
+
+    def peek(self, task_id: str, version, field: str):
+        """Cached field or None, without waiting, touching LRU order or hit stats"""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or entry["version"] != version:
+                return None
+            return entry["fields"].get(field)
+
+    def put(self, task_id: str, version, field: str, value, evict: bool = True) -> bool:
+        """Store a field for a task. Returns False if it did not fit the byte budget.
+
+        Foreground stores evict least-recently-used entries to make room; prefetch
+        stores (``evict=False``) only use free space so they never push out data
+        the user actually looked at.
+        """
+        size = _payload_size(value)
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is not None and entry["version"] != version:
+                self._drop(task_id)
+                entry = None
+            old_size = entry["sizes"].get(field, 0) if entry else 0
+            needed = self.total_bytes - old_size + size
+            if needed > self.max_bytes:
+                if not evict:
+                    return False
+                for victim in list(self._entries.keys()):
+                    if needed <= self.max_bytes:
+                        break
+                    if victim == task_id:
+                        continue
+                    needed -= self._entries[victim]["bytes"]
+                    self._drop(victim)
+                if needed > self.max_bytes:
+                    return False
+            if entry is None:
+                entry = {"version": version, "fields": {}, "sizes": {}, "bytes": 0}
+                self._entries[task_id] = entry
+            entry["fields"][field] = value
+            entry["sizes"][field] = size
+            entry["bytes"] += size - old_size
+            self.total_bytes += size - old_size
+            self._entries.move_to_end(task_id)
+            return True
+
+    def invalidate(self, task_id: str):
+        with self._lock:
+            self._drop(task_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._baselines.clear()
+            self.total_bytes = 0
+
+    def track_scrape(self, task_id: str, version, records):
+        """Return the ChangeSet from the previous scrape seen to ``records``.
+
+        The diff is computed once per new version and then reused; returns None
+        the first time a task is seen (nothing to compare against).
+        """
+        with self._lock:
+            baseline = self._baselines.get(task_id)
+            if baseline is not None and baseline["version"] == version:
+                self._baselines.move_to_end(task_id)
+                return baseline["changes"]
+        index = build_scrape_index(records)
+        changes = None
+        if baseline is not None:
+            changes = diff_scrapes(baseline["index"], records, index, baseline["version"], version)
+        with self._lock:
+            self._baselines[task_id] = {"version": version, "index": index, "changes": changes}
+            self._baselines.move_to_end(task_id)
+            while len(self._baselines) > self.max_baselines:
+                self._baselines.popitem(last=False)
+        return changes
+
+    def _drop(self, task_id: str):
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            self.total_bytes -= entry["bytes"]
+
+    def is_cached(self, task_id: str, version) -> bool:
+        with self._lock:
+            entry = self._entries.get(task_id)
+            return entry is not None and entry["version"] == version
+
+    def prefetch(self, api_client, tasks: Iterable[Dict]) -> int:
+        """Fetch details for the given tasks in the background. Returns the number submitted.
+
+        Tasks already cached at their current stamp or already in flight are
+        skipped, and at most ``max_workers`` fetches are in flight per session.
+        """
+        executor = _get_executor(self.max_workers)
+        submitted = 0
+        for task in tasks:
+            task_id = task.get("_id")
+            if not task_id:
+                continue
+            version = task.get("last_scraped")
+            with self._lock:
+                if task_id in self._pending or self.is_cached(task_id, version):
+                    continue
+                if len(self._pending) >= self.max_workers:
+                    break
+                if self.total_bytes >= self.max_bytes:
+                    break
+                future = executor.submit(self._fetch, api_client, task_id, version)
+                self._pending[task_id] = future
+            submitted += 1
+        return submitted
+
+    def _fetch(self, api_client, task_id: str, version):
+        try:
+            details = api_client.get_task_details(task_id)
+            if details is not None:
+                self.put(task_id, version, "details", details, evict=False)
+        finally:
+            with self._lock:
+                self._pending.pop(task_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "in_flight": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,204 @@
+"""
+Bulk import of tracking tasks and reels from CSV or plain text
+"""
+
+import csv
+import io
+import re
+from typing import Callable, Iterable, List, Optional
+
+from bulk_ops import RateLimiter, run_bulk
+from config import Config
+
+USERNAME_RE = re.compile(r"^[A-Za-z0-9._]{1,30}$")
+PROFILE_URL_RE = re.compile(r"instagram\.com/([A-Za-z0-9._]+)", re.IGNORECASE)
+REEL_URL_RE = re.compile(r"^(?:https?://)?(?:www\.)?instagram\.com/(?:reels?|p)/([A-Za-z0-9_-]+)", re.IGNORECASE)
+USERNAME_HEADERS = {"username", "target_profile", "profile", "handle"}
+TRUE_VALUES = {"1", "true", "yes", "y", "competitor"}
+FALSE_VALUES = {"0", "false", "no", "n", "own"}
+
+
+class ImportRow:
+    """One input row and its import outcome"""
+    __slots__ = ("line", "username", "is_competitor", "interval", "status", "task_id", "message")
+
+    def __init__(self, line: int, username: str, is_competitor: bool, interval: float,
+                 status: str = "pending", message: str = ""):
+        self.line = line
+        self.username = username
+        self.is_competitor = is_competitor
+        self.interval = interval
+        self.status = status
+        self.task_id: Optional[str] = None
+        self.message = message
+
+    def as_dict(self):
+        return {
+            "Line": self.line,
+            "Username": self.username,
+            "Type": "Competitor" if self.is_competitor else "Own Profile",
+            "Interval (days)": self.interval,
+            "Result": self.status,
+            "Details": self.message,
+        }
+
+
+def normalize_username(raw: str) -> str:
+    raw = (raw or "").strip()
+    match = PROFILE_URL_RE.search(raw)
+    if match:
+        raw = match.group(1)
+    return raw.lstrip("@").strip("/").lower()
+
+
+def _parse_flag(value: str, default: bool) -> Optional[bool]:
+    value = (value or "").strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    return None
+
+
+def parse_task_import(text: str, default_competitor: bool = True, default_interval: float = 2.0) -> List[ImportRow]:
+    """Parse `username[,competitor][,interval]` rows (optional header) or one username per line"""
+    limits = Config.IMPORT_CONFIG
+    rows: List[ImportRow] = []
+    reader = csv.reader(io.StringIO(text))
+    for line, fields in enumerate(reader, start=1):
+        fields = [field.strip() for field in fields]
+        if not fields or not fields[0] or fields[0].startswith("#"):
+            continue
+        if line == 1 and fields[0].lower() in USERNAME_HEADERS:
+            continue
+        username = normalize_username(fields[0])
+        is_competitor = _parse_flag(fields[1] if len(fields) > 1 else "", default_competitor)
+        interval = default_interval
+        message = ""
+        if len(fields) > 2 and fields[2]:
+            try:
+                interval = float(fields[2])
+            except ValueError:
+                message = f"invalid interval '{fields[2]}'"
+        if not message and not USERNAME_RE.match(username):
+            message = f"invalid username '{fields[0]}'"
+        if not message and is_competitor is None:
+            message = f"invalid competitor flag '{fields[1]}'"
+        if not message and not limits["min_interval_days"] <= interval <= limits["max_interval_days"]:
+            message = f"interval must be {limits['min_interval_days']}-{limits['max_interval_days']} days"
+        row = ImportRow(line, username, bool(is_competitor), interval)
+        if message:
+            row.status, row.message = "invalid", message
+        rows.append(row)
+    return rows
+
+
+def mark_duplicates(rows: Iterable[ImportRow], existing_profiles: Iterable[str]) -> None:
+    """Flag rows already tracked or repeated earlier in the file (set lookups)"""
+    seen = {normalize_username(profile) for profile in existing_profiles if profile}
+    for row in rows:
+        if row.status != "pending":
+            continue
+        if row.username in seen:
+            row.status, row.message = "duplicate", "already tracked or listed earlier"
+        else:
+            seen.add(row.username)
+
+
+def import_rows(api_client, rows: List[ImportRow],
+                on_progress: Optional[Callable[[int, int, ImportRow, bool], None]] = None):
+    """Create the pending rows on a bounded pool.
+
+    Each worker runs create then interval update for its row, so one row's
+    interval call overlaps with the creates of the others instead of
+    waiting behind them.
+    """
+    def create(row: ImportRow) -> bool:
+        task_id = api_client.create_tracking_task(row.username, row.is_competitor)
+        if not task_id:
+            row.status, row.message = "failed", "create request failed"
+            return False
+        row.task_id = task_id
+        if api_client.update_scrape_interval(task_id, row.interval):
+            row.status, row.message = "created", ""
+        else:
+            row.status, row.message = "created", "interval update failed; using default"
+        return True
+
+    pending = [row for row in rows if row.status == "pending"]
+    result = run_bulk(pending, create, Config.BULK_CONFIG["max_workers"], on_progress=on_progress)
+    for row, reason in result.failed:
+        if row.status == "pending":
+            row.status, row.message = "failed", reason
+    return result
+
+
+class ReelImportRow:
+    """One pasted reel URL and its import outcome"""
+    __slots__ = ("line", "url", "shortcode", "status", "task_id", "message")
+
+    def __init__(self, line: int, url: str, shortcode: Optional[str], status: str = "pending", message: str = ""):
+        self.line = line
+        self.url = url
+        self.shortcode = shortcode
+        self.status = status
+        self.task_id: Optional[str] = None
+        self.message = message
+
+    def as_dict(self):
+        return {"Line": self.line, "Reel URL": self.url, "Result": self.status, "Details": self.message}
+
+
+def reel_shortcode(url: str) -> Optional[str]:
+    match = REEL_URL_RE.match((url or "").strip())
+    return match.group(1) if match else None
+
+
+def parse_reel_urls(text: str, existing_urls: Iterable[str] = ()) -> List[ReelImportRow]:
+    """Validate pasted reel URLs (one per line, or comma separated) and flag duplicates.
+
+    URLs are canonicalized to ``https://www.instagram.com/reel/<code>/`` and
+    deduplicated by shortcode against the project's tracked reels and
+    earlier lines.
+    """
+    seen = {code for code in (reel_shortcode(url) for url in existing_urls) if code}
+    rows: List[ReelImportRow] = []
+    for line, raw_line in enumerate(text.splitlines(), start=1):
+        for raw in raw_line.replace(",", " ").split():
+            code = reel_shortcode(raw)
+            if code is None:
+                rows.append(ReelImportRow(line, raw, None, "invalid", "not an Instagram reel URL"))
+                continue
+            row = ReelImportRow(line, f"https://www.instagram.com/reel/{code}/", code)
+            if code in seen:
+                row.status, row.message = "duplicate", "already tracked or listed earlier"
+            else:
+                seen.add(code)
+            rows.append(row)
+    return rows
+
+
+def import_reels(api_client, project: str, rows: List[ReelImportRow], interval: float,
+                 on_progress: Optional[Callable[[int, int, ReelImportRow, bool], None]] = None):
+    """Create the pending reel tasks concurrently, rate limited, with one list invalidation at the end"""
+    def create(row: ReelImportRow) -> bool:
+        task_id = api_client.create_reel_tracking_task(project, row.url, interval, invalidate=False)
+        if not task_id:
+            row.status, row.message = "failed", "create request failed"
+            return False
+        row.task_id = task_id
+        row.status = "created"
+        return True
+
+    pending = [row for row in rows if row.status == "pending"]
+    result = run_bulk(
+        pending, create, Config.BULK_CONFIG["max_workers"], on_progress=on_progress,
+        rate_limiter=RateLimiter(Config.BULK_CONFIG["reel_requests_per_second"]),
+    )
+    for row, reason in result.failed:
+        if row.status == "pending":
+            row.status, row.message = "failed", reason
+    api_client.invalidate_list_cache(f"reels:{project}")
+    return result
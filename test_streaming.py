@@ -5,7 +5,7 @@ Test script for streaming functionality
 
 import json
 import time
-from main import APIClient
+from api_client import APIClient
 from config import Config
 
 def test_streaming():